@@ -0,0 +1,55 @@
+"""JSON codec for hot paths: orjson when installed, stdlib json otherwise.
+
+Both paths produce compact output, accept non-str dict keys and serialize NumPy
+scalars/arrays. Decode errors are ``json.JSONDecodeError`` either way (orjson's
+error subclasses it).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None  # type: ignore[assignment]
+
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    # NumPy scalars and arrays both expose tolist(); anything else is a genuine error.
+    tolist = getattr(obj, "tolist", None)
+    if tolist is not None:
+        return tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_str(obj: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            # orjson rejects a few values stdlib json accepts (e.g. ints beyond 64 bits).
+            pass
+    return json.dumps(obj, ensure_ascii=True, separators=(",", ":"), default=_default)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """UTF-8 encoded compact JSON, skipping orjson's bytes -> str round trip."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=True, separators=(",", ":"), default=_default).encode("ascii")
+
+
+def loads(raw: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,24 +1,35 @@
 from __future__ import annotations
 
+import base64
+import heapq
+from itertools import islice
 from typing import Any
 
-from grumpyclaw.memory.retriever import Retriever
-from grumpyclaw.skills.registry import get_skill_content, list_skills
-from grumpyreachy.heartbeat_bridge import HeartbeatBridge
+from grumpyclaw.memory.retriever import get_retriever
+from grumpyclaw.skills.registry import cached_skills, get_skill_content
+from grumpyreachy.heartbeat_bridge import get_heartbeat_bridge
 
-from .db import dump_json, get_conn, load_json
+from .db import BatchWriter, dump_json, load_json, read_conn, write_conn
+from .search_cache import search_cache
+
+_SQL_INSERT_HEARTBEAT_HISTORY = "INSERT INTO app_heartbeat_history(status, message, context_json) VALUES (?, ?, ?)"
+_SQL_HEARTBEAT_HISTORY = (
+    "SELECT id, status, message, context_json, created_at FROM app_heartbeat_history ORDER BY id DESC LIMIT ?"
+)
 
 
 class AdminDataService:
-    def __init__(self) -> None:
-        self._retriever = Retriever()
-        self._heartbeat = HeartbeatBridge()
+    def __init__(self, log_writers: tuple[BatchWriter, ...] = ()) -> None:
+        self._retriever = get_retriever()
+        self._heartbeat = get_heartbeat_bridge()
+        # Writers whose queued rows logs() and heartbeat_history() must see; flushed before each read.
+        self._log_writers = log_writers
 
     def search_memory(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
-        return self._retriever.hybrid_search(query=query, top_k=top_k)
+        return search_cache.search(self._retriever, query, top_k)
 
     def skills(self) -> list[dict[str, Any]]:
-        rows = list_skills()
+        rows = cached_skills()
         return [
             {
                 "id": item["id"],
@@ -37,15 +48,8 @@ class AdminDataService:
 
     def evaluate_heartbeat(self) -> dict[str, Any]:
         result = self._heartbeat.evaluate()
-        conn = get_conn()
-        try:
-            conn.execute(
-                "INSERT INTO app_heartbeat_history(status, message, context_json) VALUES (?, ?, ?)",
-                (result.status, result.message, dump_json(result.context)),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        with write_conn() as conn:
+            conn.execute(_SQL_INSERT_HEARTBEAT_HISTORY, (result.status, result.message, dump_json(result.context)))
         return {
             "status": result.status,
             "message": result.message,
@@ -53,24 +57,19 @@ class AdminDataService:
         }
 
     def heartbeat_history(self, limit: int = 50) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
-            rows = conn.execute(
-                "SELECT id, status, message, context_json, created_at FROM app_heartbeat_history ORDER BY id DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-            return [
-                {
-                    "id": row["id"],
-                    "status": row["status"],
-                    "message": row["message"],
-                    "context": load_json(row["context_json"]),
-                    "created_at": row["created_at"],
-                }
-                for row in rows
-            ]
-        finally:
-            conn.close()
+        self._flush_log_writers()
+        with read_conn() as conn:
+            rows = conn.execute(_SQL_HEARTBEAT_HISTORY, (limit,)).fetchall()
+        return [
+            {
+                "id": row_id,
+                "status": status,
+                "message": message,
+                "context": load_json(context_json),
+                "created_at": created_at,
+            }
+            for row_id, status, message, context_json, created_at in rows
+        ]
 
     def logs(
         self,
@@ -80,12 +79,22 @@ class AdminDataService:
         event_type: str | None = None,
         q: str | None = None,
         limit: int = 200,
-    ) -> list[dict[str, Any]]:
+        cursor: str | None = None,
+        include_payload: bool = False,
+    ) -> dict[str, Any]:
+        """Return newest-first log entries from runtime and robot tables, keyset-paginated.
+
+        ``next_cursor`` is set when the page is full; pass it back as ``cursor`` to continue.
+        Entries carry a ``payload_preview`` string truncated by SQLite unless
+        ``include_payload`` asks for the decoded ``payload``.
+        """
         normalized_level = level.strip().upper() if level else None
         query_text = q.strip() if q else None
-        conn = get_conn()
-        try:
-            entries: list[dict[str, Any]] = []
+        after = _decode_log_cursor(cursor) if cursor else None
+        payload_col = "payload_json" if include_payload else _PAYLOAD_PREVIEW_COL
+        self._flush_log_writers()
+        streams: list[list[tuple[tuple[Any, ...], dict[str, Any]]]] = []
+        with read_conn() as conn:
             if source in {None, "runtime"}:
                 clauses = []
                 params: list[Any] = []
@@ -101,66 +110,119 @@ class AdminDataService:
                 if query_text:
                     clauses.append("payload_json LIKE ?")
                     params.append(f"%{query_text}%")
+                if after:
+                    clause, clause_params = _keyset_clause("runtime", after)
+                    clauses.append(clause)
+                    params.extend(clause_params)
                 where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
                 rows = conn.execute(
                     f"""
-                    SELECT process_name, source, level, event_type, payload_json, created_at
+                    SELECT id, process_name, source, level, event_type, {payload_col}, created_at
                     FROM app_process_events
                     {where}
-                    ORDER BY id DESC
+                    ORDER BY created_at DESC, id DESC
                     LIMIT ?
                     """,
                     (*params, limit),
                 ).fetchall()
-                entries.extend(
-                    {
-                        "source": row["source"],
-                        "name": row["process_name"],
-                        "level": row["level"],
-                        "event_type": row["event_type"],
-                        "payload": load_json(row["payload_json"]),
-                        "created_at": row["created_at"],
-                    }
-                    for row in rows
+                streams.append(
+                    [
+                        (
+                            (created_at, "runtime", row_id),
+                            {
+                                "source": row_source,
+                                "name": name,
+                                "level": row_level,
+                                "event_type": row_event_type,
+                                **_payload_field(payload, include_payload),
+                                "created_at": created_at,
+                            },
+                        )
+                        for row_id, name, row_source, row_level, row_event_type, payload, created_at in rows
+                    ]
                 )
 
-            if source in {None, "robot"}:
+            # Robot rows only ever carry event_type "robot.action"; skip the query for other filters.
+            if source in {None, "robot"} and event_type in {None, "", "robot.action"}:
                 clauses = []
                 params = []
                 if normalized_level:
                     clauses.append("level = ?")
                     params.append(normalized_level)
-                if event_type and event_type != "robot.action":
-                    clauses.append("1 = 0")
                 if query_text:
                     clauses.append("(reason LIKE ? OR payload_json LIKE ?)")
                     params.extend([f"%{query_text}%", f"%{query_text}%"])
+                if after:
+                    clause, clause_params = _keyset_clause("robot", after)
+                    clauses.append(clause)
+                    params.extend(clause_params)
                 where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
                 rows = conn.execute(
                     f"""
-                    SELECT id, source, level, action, payload_json, accepted, reason, created_at
+                    SELECT id, source, level, action, {payload_col}, accepted, reason, created_at
                     FROM app_robot_actions
                     {where}
-                    ORDER BY datetime(created_at) DESC
+                    ORDER BY created_at DESC, id DESC
                     LIMIT ?
                     """,
                     (*params, limit),
                 ).fetchall()
-                entries.extend(
-                    {
-                        "source": row["source"],
-                        "name": row["action"],
-                        "level": row["level"],
-                        "event_type": "robot.action",
-                        "payload": load_json(row["payload_json"]),
-                        "accepted": bool(row["accepted"]),
-                        "reason": row["reason"],
-                        "created_at": row["created_at"],
-                    }
-                    for row in rows
+                streams.append(
+                    [
+                        (
+                            (created_at, "robot", row_id),
+                            {
+                                "source": row_source,
+                                "name": name,
+                                "level": row_level,
+                                "event_type": "robot.action",
+                                **_payload_field(payload, include_payload),
+                                "accepted": bool(accepted),
+                                "reason": reason,
+                                "created_at": created_at,
+                            },
+                        )
+                        for row_id, row_source, row_level, name, payload, accepted, reason, created_at in rows
+                    ]
                 )
 
-            entries.sort(key=lambda x: x["created_at"], reverse=True)
-            return entries[:limit]
-        finally:
-            conn.close()
+        # Each stream is already sorted newest-first, so a lazy merge replaces the full sort.
+        page = list(islice(heapq.merge(*streams, key=lambda item: item[0], reverse=True), limit))
+        next_cursor = _encode_log_cursor(page[-1][0]) if len(page) == limit else None
+        return {"items": [entry for _, entry in page], "next_cursor": next_cursor}
+
+    def _flush_log_writers(self) -> None:
+        for writer in self._log_writers:
+            writer.flush()
+
+
+_PAYLOAD_PREVIEW_CHARS = 200
+_PAYLOAD_PREVIEW_COL = f"substr(payload_json, 1, {_PAYLOAD_PREVIEW_CHARS}) AS payload_preview"
+
+
+def _payload_field(payload: str, include_payload: bool) -> dict[str, Any]:
+    if include_payload:
+        return {"payload": load_json(payload)}
+    return {"payload_preview": payload}
+
+
+def _encode_log_cursor(key: tuple[Any, ...]) -> str:
+    return base64.urlsafe_b64encode(dump_json(list(key)).encode("utf-8")).decode("ascii")
+
+
+def _decode_log_cursor(cursor: str) -> tuple[Any, ...]:
+    try:
+        created_at, kind, row_id = load_json(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    return str(created_at), str(kind), row_id
+
+
+def _keyset_clause(kind: str, after: tuple[Any, ...]) -> tuple[str, list[Any]]:
+    """Rows of one log table that sort after ``after`` in (created_at, kind, id) DESC order."""
+    created_at, after_kind, row_id = after
+    if kind < after_kind:
+        return "created_at <= ?", [created_at]
+    if kind > after_kind:
+        return "created_at < ?", [created_at]
+    return "(created_at, id) < (?, ?)", [created_at, row_id]
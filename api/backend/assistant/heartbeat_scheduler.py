@@ -1,60 +1,95 @@
 from __future__ import annotations
 
+import asyncio
 import threading
 from datetime import datetime, timezone
 from typing import Any, Callable
 
 
 class HeartbeatScheduler:
-    """In-process heartbeat scheduler with manual trigger support."""
+    """In-process heartbeat scheduler with manual trigger support.
+
+    Scheduled runs are an asyncio task on the event loop that was running when
+    start() was first called; the blocking heartbeat work runs via asyncio.to_thread.
+    start()/stop() may be called from any thread; the lock only guards that lifecycle.
+    """
 
     def __init__(self, interval_seconds: int, run_once: Callable[[str], dict[str, Any]]):
         self._interval_seconds = max(30, int(interval_seconds))
         self._run_once = run_once
         self._lock = threading.Lock()
-        self._thread: threading.Thread | None = None
-        self._stop = threading.Event()
-        self._last_run_at: str | None = None
-        self._last_result: dict[str, Any] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._running = False
+        # (last_run_at, last_result), swapped as one reference so status() can read it without the lock.
+        self._last_run: tuple[str | None, dict[str, Any] | None] = (None, None)
 
     def start(self) -> None:
         with self._lock:
-            if self._thread and self._thread.is_alive():
+            if self._running:
                 return
-            self._stop.clear()
-            self._thread = threading.Thread(target=self._loop, name="assistant-heartbeat", daemon=True)
-            self._thread.start()
+            if self._loop is None or self._loop.is_closed():
+                try:
+                    self._loop = asyncio.get_running_loop()
+                except RuntimeError as exc:
+                    raise RuntimeError("HeartbeatScheduler.start() needs a running event loop") from exc
+            self._running = True
+            self._call_in_loop(self._spawn_task)
 
     def stop(self) -> None:
-        self._stop.set()
         with self._lock:
-            thread = self._thread
-        if thread and thread.is_alive():
-            thread.join(timeout=3.0)
+            if not self._running:
+                return
+            self._running = False
+            try:
+                self._call_in_loop(self._cancel_task)
+            except RuntimeError:
+                # Loop already closed; its pending task went with it.
+                self._task = None
 
     def run_now(self) -> dict[str, Any]:
         result = self._safe_run("manual")
-        with self._lock:
-            self._last_result = result
-            self._last_run_at = datetime.now(timezone.utc).isoformat()
+        self._record(result)
         return result
 
     def status(self) -> dict[str, Any]:
-        with self._lock:
-            running = bool(self._thread and self._thread.is_alive() and not self._stop.is_set())
-            return {
-                "running": running,
-                "interval_seconds": self._interval_seconds,
-                "last_run_at": self._last_run_at,
-                "last_result": self._last_result,
-            }
+        last_run_at, last_result = self._last_run
+        return {
+            "running": self._running,
+            "interval_seconds": self._interval_seconds,
+            "last_run_at": last_run_at,
+            "last_result": last_result,
+        }
+
+    def _call_in_loop(self, callback: Callable[[], None]) -> None:
+        loop = self._loop
+        assert loop is not None
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            callback()
+        else:
+            loop.call_soon_threadsafe(callback)
+
+    def _spawn_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop_task())
+
+    def _cancel_task(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+
+    async def _loop_task(self) -> None:
+        while True:
+            await asyncio.sleep(float(self._interval_seconds))
+            result = await asyncio.to_thread(self._safe_run, "scheduled")
+            self._record(result)
 
-    def _loop(self) -> None:
-        while not self._stop.wait(timeout=float(self._interval_seconds)):
-            result = self._safe_run("scheduled")
-            with self._lock:
-                self._last_result = result
-                self._last_run_at = datetime.now(timezone.utc).isoformat()
+    def _record(self, result: dict[str, Any]) -> None:
+        self._last_run = (datetime.now(timezone.utc).isoformat(), result)
 
     def _safe_run(self, trigger: str) -> dict[str, Any]:
         try:
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import logging
+import sqlite3
 import threading
-import uuid
-from datetime import datetime, timezone
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
 
-from grumpyclaw.memory.retriever import Retriever
-from grumpyclaw.skills.registry import list_skills
-from grumpyreachy.heartbeat_bridge import HeartbeatBridge
+from grumpyclaw.memory.retriever import get_retriever
+from grumpyclaw.skills.registry import cached_skills
+from grumpyreachy.heartbeat_bridge import get_heartbeat_bridge
 
-from ..db import dump_json, get_conn, load_json
+from ..db import BatchWriter, dump_json, load_json, new_id, now_iso, read_conn, write_conn
 from ..event_bus import EventBus, StreamEvent
+from ..search_cache import search_cache
 from .heartbeat_scheduler import HeartbeatScheduler
 from .realtime_service import OpenAIRealtimeService
 from .text_gateway import OpenAITextGateway
@@ -19,23 +24,108 @@ from .tools import ToolDispatcher
 
 LOG = logging.getLogger("grumpyadmin.assistant")
 
+# Streamed deltas are coalesced into one assistant.token event per window.
+_TOKEN_FLUSH_SECONDS = 0.025
+_TOKEN_FLUSH_COUNT = 8
+# Sessions whose prompt history is kept in memory between turns.
+_SESSION_CACHE_SIZE = 128
+_REPLY_WORKERS = 8
+_RUNTIME_STATUS_TTL_SECONDS = 0.25
+_CONTEXT_SNIPPET_CHARS = 240
+_EMPTY_META_JSON = dump_json({})
+_STREAMING_META_JSON = dump_json({"streaming": True})
+_FINAL_META_JSON = dump_json({"streaming": False})
+
+# Hot-path statements are module constants so every call hits the connection's statement cache.
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_TOUCH_SESSION = "UPDATE app_chat_sessions SET updated_at = ? WHERE id = ?"
+_SQL_FINALIZE_MESSAGE = "UPDATE app_chat_messages SET content = ?, status = ?, meta_json = ? WHERE id = ?"
+_SQL_LIST_MESSAGES = """
+    SELECT id, session_id, role, content, status, created_at, meta_json
+    FROM app_chat_messages
+    WHERE session_id = ?
+    ORDER BY rowid ASC
+"""
+_SQL_HISTORY_FOR_LLM = """
+    SELECT id, role, content
+    FROM app_chat_messages
+    WHERE session_id = ? AND role IN ('user', 'assistant') AND content != ''
+    ORDER BY rowid ASC
+"""
+_SQL_REALTIME_AFTER = """
+    SELECT id, event_type, payload_json, created_at
+    FROM app_realtime_events
+    WHERE id > ?
+    ORDER BY id ASC
+    LIMIT ?
+"""
+_SQL_REALTIME_BEFORE = """
+    SELECT id, event_type, payload_json, created_at
+    FROM (
+        SELECT id, event_type, payload_json, created_at
+        FROM app_realtime_events
+        WHERE id < ?
+        ORDER BY id DESC
+        LIMIT ?
+    )
+    ORDER BY id ASC
+"""
+_SQL_REALTIME_NEWEST = """
+    SELECT id, event_type, payload_json, created_at
+    FROM (
+        SELECT id, event_type, payload_json, created_at
+        FROM app_realtime_events
+        ORDER BY id DESC
+        LIMIT ?
+    )
+    ORDER BY id ASC
+"""
+_SQL_INSERT_REALTIME_EVENT = "INSERT INTO app_realtime_events(event_type, payload_json) VALUES (?, ?)"
+_SQL_INSERT_HEARTBEAT_RUN = """
+    INSERT INTO app_heartbeat_runs(status, message, context_json, trigger, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_PROCESS_EVENT = """
+    INSERT INTO app_process_events(process_name, source, level, event_type, payload_json)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_HEARTBEAT_HISTORY = "INSERT INTO app_heartbeat_history(status, message, context_json) VALUES (?, ?, ?)"
+
 
 def _system_prompt() -> str:
+    try:
+        skills = tuple((skill["name"], skill["id"]) for skill in cached_skills())
+    except Exception:
+        skills = ()
+    return _render_system_prompt(skills)
+
+
+@lru_cache(maxsize=8)
+def _render_system_prompt(skills: tuple[tuple[str, str], ...]) -> str:
     parts = [
         "You are a helpful personal AI assistant.",
         "Use memory and local skills when relevant.",
     ]
-    try:
-        skills = list_skills()
-        if skills:
-            parts.append("Available skills:")
-            for skill in skills:
-                parts.append(f"- {skill['name']}: {skill['id']}")
-    except Exception:
-        pass
+    if skills:
+        parts.append("Available skills:")
+        for name, skill_id in skills:
+            parts.append(f"- {name}: {skill_id}")
     return "\n".join(parts)
 
 
+def _iter_realtime_events(rows: Iterable[tuple[Any, ...]]) -> Iterator[dict[str, Any]]:
+    for event_id, event_type, payload_json, created_at in rows:
+        yield {
+            "id": event_id,
+            "event_type": event_type,
+            "payload": load_json(payload_json),
+            "created_at": created_at,
+        }
+
+
 class AssistantManager:
     """Centralized orchestration for text chat, realtime and heartbeat."""
 
@@ -44,8 +134,8 @@ class AssistantManager:
         self._config = config
         self._robot_service = robot_service
 
-        self._retriever = Retriever()
-        self._heartbeat_bridge = HeartbeatBridge()
+        self._retriever = get_retriever()
+        self._heartbeat_bridge = get_heartbeat_bridge()
         self._tools = ToolDispatcher(robot_service=robot_service)
 
         self._text_gateway = OpenAITextGateway(
@@ -68,6 +158,16 @@ class AssistantManager:
             interval_seconds=config.heartbeat_interval_seconds,
             run_once=self._run_heartbeat_once,
         )
+        # session_id -> (prompt messages, ids of the rows they came from)
+        self._session_cache: OrderedDict[str, tuple[list[dict[str, str]], set[str]]] = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+        self._runtime_status_cache: tuple[float, dict[str, Any]] | None = None
+        self._reply_pool = ThreadPoolExecutor(
+            max_workers=_REPLY_WORKERS,
+            thread_name_prefix="assistant-reply",
+        )
+        # Realtime and heartbeat rows are appended off the caller's thread.
+        self.event_writer = BatchWriter(name="assistant-event-writer")
 
     def start(self) -> None:
         self._heartbeat_scheduler.start()
@@ -75,39 +175,48 @@ class AssistantManager:
     def shutdown(self) -> None:
         self._heartbeat_scheduler.stop()
         self._realtime_service.stop()
+        self._reply_pool.shutdown(wait=False, cancel_futures=True)
+        self.event_writer.close()
 
     def runtime_status(self) -> dict[str, Any]:
-        return {
+        # Dashboards poll this; serve a snapshot for a short window instead of fanning out each time.
+        cached = self._runtime_status_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _RUNTIME_STATUS_TTL_SECONDS:
+            return cached[1]
+        status = {
             "heartbeat": self.heartbeat_status(),
             "realtime": self.realtime_status(),
             "robot": self._robot_service.status(),
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": now_iso(),
         }
+        self._runtime_status_cache = (now, status)
+        return status
+
+    def _invalidate_runtime_status(self) -> None:
+        self._runtime_status_cache = None
 
     def create_session(self, mode: str, title: str | None = None) -> dict[str, Any]:
-        session_id = str(uuid.uuid4())
-        ts = datetime.now(timezone.utc).isoformat()
-        conn = get_conn()
-        try:
+        session_id = new_id()
+        ts = now_iso()
+        with write_conn() as conn:
             conn.execute(
                 "INSERT INTO app_chat_sessions(id, mode, title, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
                 (session_id, mode, title or f"{mode} session", ts, ts),
             )
-            conn.commit()
-        finally:
-            conn.close()
+        with self._session_cache_lock:
+            self._cache_session(session_id, [], set())
         return {"session_id": session_id, "mode": mode, "created_at": ts}
 
     def list_sessions(self, mode: str | None = None, limit: int = 50, offset: int = 0) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
+        with read_conn() as conn:
             if mode:
                 rows = conn.execute(
                     """
                     SELECT id, mode, title, created_at, updated_at
                     FROM app_chat_sessions
                     WHERE mode = ?
-                    ORDER BY datetime(updated_at) DESC
+                    ORDER BY updated_at DESC
                     LIMIT ? OFFSET ?
                     """,
                     (mode, limit, offset),
@@ -117,96 +226,86 @@ class AssistantManager:
                     """
                     SELECT id, mode, title, created_at, updated_at
                     FROM app_chat_sessions
-                    ORDER BY datetime(updated_at) DESC
+                    ORDER BY updated_at DESC
                     LIMIT ? OFFSET ?
                     """,
                     (limit, offset),
                 ).fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            conn.close()
+        return [dict(row) for row in rows]
 
     def list_messages(self, session_id: str) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
-            rows = conn.execute(
-                """
-                SELECT id, session_id, role, content, status, created_at, meta_json
-                FROM app_chat_messages
-                WHERE session_id = ?
-                ORDER BY datetime(created_at) ASC, id ASC
-                """,
-                (session_id,),
-            ).fetchall()
-            return [
-                {
-                    "id": row["id"],
-                    "session_id": row["session_id"],
-                    "role": row["role"],
-                    "content": row["content"],
-                    "status": row["status"],
-                    "created_at": row["created_at"],
-                    "meta": load_json(row["meta_json"]),
-                }
-                for row in rows
-            ]
-        finally:
-            conn.close()
+        with read_conn() as conn:
+            rows = conn.execute(_SQL_LIST_MESSAGES, (session_id,)).fetchall()
+        return [
+            {
+                "id": message_id,
+                "session_id": message_session_id,
+                "role": role,
+                "content": content,
+                "status": status,
+                "created_at": created_at,
+                "meta": load_json(meta_json),
+            }
+            for message_id, message_session_id, role, content, status, created_at, meta_json in rows
+        ]
 
     def enqueue_user_message(self, session_id: str, content: str) -> dict[str, Any]:
-        user_id = str(uuid.uuid4())
-        assistant_id = str(uuid.uuid4())
-        ts = datetime.now(timezone.utc).isoformat()
+        user_id = new_id()
+        assistant_id = new_id()
+        ts = now_iso()
 
-        conn = get_conn()
+        # The session_id foreign key rejects unknown sessions; no separate lookup needed.
         try:
-            session = conn.execute("SELECT mode FROM app_chat_sessions WHERE id = ?", (session_id,)).fetchone()
-            if not session:
-                raise ValueError("session not found")
-            conn.execute(
-                """
-                INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
-                VALUES (?, ?, 'user', ?, 'final', ?, ?)
-                """,
-                (user_id, session_id, content, ts, dump_json({})),
-            )
-            conn.execute(
-                """
-                INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
-                VALUES (?, ?, 'assistant', '', 'processing', ?, ?)
-                """,
-                (assistant_id, session_id, ts, dump_json({"streaming": True})),
-            )
-            conn.execute("UPDATE app_chat_sessions SET updated_at = ? WHERE id = ?", (ts, session_id))
-            conn.commit()
-        finally:
-            conn.close()
-
-        threading.Thread(
-            target=self._process_assistant_reply,
-            args=(session_id, assistant_id, content),
-            daemon=True,
-        ).start()
+            with write_conn() as conn:
+                conn.executemany(
+                    _SQL_INSERT_MESSAGE,
+                    (
+                        (user_id, session_id, "user", content, "final", ts, _EMPTY_META_JSON),
+                        (assistant_id, session_id, "assistant", "", "processing", ts, _STREAMING_META_JSON),
+                    ),
+                )
+                conn.execute(_SQL_TOUCH_SESSION, (ts, session_id))
+        except sqlite3.IntegrityError as exc:
+            if "FOREIGN KEY" in str(exc):
+                raise ValueError("session not found") from exc
+            raise
+        self._remember_message(session_id, user_id, "user", content)
+
+        self._reply_pool.submit(self._process_assistant_reply, session_id, assistant_id, content)
 
         return {"message_id": assistant_id, "queued": True}
 
     def _process_assistant_reply(self, session_id: str, assistant_id: str, user_text: str) -> None:
         channel = f"assistant:{session_id}"
         token_buffer: list[str] = []
+        pending: list[str] = []
+        last_flush = time.monotonic()
+
+        def flush_tokens() -> None:
+            nonlocal last_flush
+            last_flush = time.monotonic()
+            if not pending:
+                return
+            chunk = "".join(pending)
+            pending.clear()
+            self._event_bus.publish(
+                channel,
+                StreamEvent(
+                    event="assistant.token",
+                    data={"session_id": session_id, "message_id": assistant_id, "token": chunk},
+                ),
+            )
+
         try:
-            history = self.list_messages(session_id)
-            messages: list[dict[str, Any]] = []
-            for item in history:
-                role = str(item.get("role", ""))
-                content = str(item.get("content", ""))
-                if role in {"user", "assistant"} and content:
-                    messages.append({"role": role, "content": content})
+            messages: list[dict[str, Any]] = self._history_for_llm(session_id)
 
             # Retrieval augmentation.
             try:
-                hits = self._retriever.hybrid_search(user_text, top_k=5)
+                hits = search_cache.search(
+                    self._retriever, user_text, top_k=5, snippet_chars=_CONTEXT_SNIPPET_CHARS
+                )
                 if hits:
-                    context = "\n".join(f"[{h['title']}] {h['content'][:240]}" for h in hits)
+                    context = "\n".join([f"[{h['title']}] {h['content']}" for h in hits])
                     messages.append(
                         {
                             "role": "user",
@@ -221,15 +320,15 @@ class AssistantManager:
                     token = str(evt.get("delta", ""))
                     if token:
                         token_buffer.append(token)
-                        self._event_bus.publish(
-                            channel,
-                            StreamEvent(
-                                event="assistant.token",
-                                data={"session_id": session_id, "message_id": assistant_id, "token": token},
-                            ),
-                        )
+                        pending.append(token)
+                        if (
+                            len(pending) >= _TOKEN_FLUSH_COUNT
+                            or time.monotonic() - last_flush >= _TOKEN_FLUSH_SECONDS
+                        ):
+                            flush_tokens()
                     continue
 
+                flush_tokens()
                 if evt["type"] == "tool":
                     self._event_bus.publish(
                         channel,
@@ -250,7 +349,7 @@ class AssistantManager:
                     final = str(evt.get("text", "") or "").strip()
                     if not final:
                         final = "".join(token_buffer).strip()
-                    self._set_assistant_final(assistant_id, final)
+                    self._set_assistant_final(session_id, assistant_id, final)
                     self._event_bus.publish(
                         channel,
                         StreamEvent(
@@ -260,8 +359,9 @@ class AssistantManager:
                     )
                     return
 
+            flush_tokens()
             final = "".join(token_buffer)
-            self._set_assistant_final(assistant_id, final)
+            self._set_assistant_final(session_id, assistant_id, final)
             self._event_bus.publish(
                 channel,
                 StreamEvent(
@@ -271,7 +371,7 @@ class AssistantManager:
             )
         except Exception as exc:
             LOG.exception("assistant reply failed")
-            self._set_assistant_final(assistant_id, f"Error: {exc}", status="error")
+            self._set_assistant_final(session_id, assistant_id, f"Error: {exc}", status="error")
             self._event_bus.publish(
                 channel,
                 StreamEvent(
@@ -280,62 +380,100 @@ class AssistantManager:
                 ),
             )
 
-    def _set_assistant_final(self, message_id: str, content: str, status: str = "final") -> None:
-        conn = get_conn()
-        try:
-            conn.execute(
-                "UPDATE app_chat_messages SET content = ?, status = ?, meta_json = ? WHERE id = ?",
-                (content, status, dump_json({"streaming": False}), message_id),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    def _set_assistant_final(self, session_id: str, message_id: str, content: str, status: str = "final") -> None:
+        with write_conn() as conn:
+            conn.execute(_SQL_FINALIZE_MESSAGE, (content, status, _FINAL_META_JSON, message_id))
+        self._remember_message(session_id, message_id, "assistant", content)
+
+    def _history_for_llm(self, session_id: str) -> list[dict[str, Any]]:
+        """Return user/assistant turns for the prompt, loading from SQLite only on a cache miss."""
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+            if cached is None:
+                # Load under the lock so a concurrent _remember_message cannot slip between read and insert.
+                with read_conn() as conn:
+                    rows = conn.execute(_SQL_HISTORY_FOR_LLM, (session_id,)).fetchall()
+                cached = (
+                    [{"role": row["role"], "content": row["content"]} for row in rows],
+                    {row["id"] for row in rows},
+                )
+                self._cache_session(session_id, *cached)
+            else:
+                self._session_cache.move_to_end(session_id)
+            return list(cached[0])
+
+    def _remember_message(self, session_id: str, message_id: str, role: str, content: str) -> None:
+        if not content:
+            return
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+            if cached is None or message_id in cached[1]:
+                return
+            cached[0].append({"role": role, "content": content})
+            cached[1].add(message_id)
+
+    def _cache_session(self, session_id: str, messages: list[dict[str, str]], ids: set[str]) -> None:
+        self._session_cache[session_id] = (messages, ids)
+        self._session_cache.move_to_end(session_id)
+        while len(self._session_cache) > _SESSION_CACHE_SIZE:
+            self._session_cache.popitem(last=False)
 
     def realtime_start(self) -> dict[str, Any]:
-        return self._realtime_service.start()
+        try:
+            return self._realtime_service.start()
+        finally:
+            self._invalidate_runtime_status()
 
     def realtime_stop(self) -> dict[str, Any]:
-        return self._realtime_service.stop()
+        try:
+            return self._realtime_service.stop()
+        finally:
+            self._invalidate_runtime_status()
 
     def realtime_status(self) -> dict[str, Any]:
         return self._realtime_service.status()
 
-    def realtime_history(self, limit: int = 200) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
-            rows = conn.execute(
-                """
-                SELECT id, event_type, payload_json, created_at
-                FROM app_realtime_events
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-            items = [
-                {
-                    "id": row["id"],
-                    "event_type": row["event_type"],
-                    "payload": load_json(row["payload_json"]),
-                    "created_at": row["created_at"],
-                }
-                for row in rows
-            ]
-            items.reverse()
-            return items
-        finally:
-            conn.close()
+    def realtime_history(
+        self,
+        limit: int = 200,
+        before_id: int | None = None,
+        after_id: int | None = None,
+    ) -> dict[str, Any]:
+        """Return a keyset page of realtime events, oldest first.
+
+        Without ``after_id`` the page is the newest ``limit`` events older than ``before_id``;
+        ``next_cursor`` is then the id to pass as ``before_id`` for the preceding page.
+        With ``after_id`` the page is the next ``limit`` events after it, and ``next_cursor``
+        is the id to pass as ``after_id`` to continue forward.
+        """
+        if after_id is not None:
+            sql, params = _SQL_REALTIME_AFTER, (after_id, limit)
+        elif before_id is not None:
+            sql, params = _SQL_REALTIME_BEFORE, (before_id, limit)
+        else:
+            sql, params = _SQL_REALTIME_NEWEST, (limit,)
+        self.event_writer.flush()
+        with read_conn() as conn:
+            items = list(_iter_realtime_events(conn.execute(sql, params)))
+        next_cursor = None
+        if len(items) == limit:
+            next_cursor = items[-1]["id"] if after_id is not None else items[0]["id"]
+        return {"items": items, "next_cursor": next_cursor}
 
     def heartbeat_start(self) -> dict[str, Any]:
         self._heartbeat_scheduler.start()
+        self._invalidate_runtime_status()
         return self.heartbeat_status()
 
     def heartbeat_stop(self) -> dict[str, Any]:
         self._heartbeat_scheduler.stop()
+        self._invalidate_runtime_status()
         return self.heartbeat_status()
 
     def heartbeat_run_now(self) -> dict[str, Any]:
-        return self._heartbeat_scheduler.run_now()
+        result = self._heartbeat_scheduler.run_now()
+        self._invalidate_runtime_status()
+        return result
 
     def heartbeat_status(self) -> dict[str, Any]:
         return self._heartbeat_scheduler.status()
@@ -347,59 +485,42 @@ class AssistantManager:
             "message": result.message,
             "context": result.context,
             "trigger": trigger,
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": now_iso(),
         }
+        # Serialize once; the context is stored twice.
+        context_json = dump_json(result.context)
+        payload_json = dump_json(payload)
 
-        conn = get_conn()
-        try:
-            conn.execute(
-                """
-                INSERT INTO app_heartbeat_runs(status, message, context_json, trigger, created_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
+        self.event_writer.submit_many(
+            [
                 (
-                    payload["status"],
-                    payload["message"],
-                    dump_json(payload["context"]),
-                    payload["trigger"],
-                    payload["ts"],
+                    _SQL_INSERT_HEARTBEAT_RUN,
+                    (payload["status"], payload["message"], context_json, trigger, payload["ts"]),
                 ),
-            )
-            conn.execute(
-                """
-                INSERT INTO app_process_events(process_name, source, level, event_type, payload_json)
-                VALUES (?, ?, ?, ?, ?)
-                """,
                 (
-                    "heartbeat",
-                    "runtime",
-                    "INFO" if payload["status"] == "HEARTBEAT_OK" else "WARNING",
-                    "runtime.heartbeat",
-                    dump_json(payload),
+                    _SQL_INSERT_PROCESS_EVENT,
+                    (
+                        "heartbeat",
+                        "runtime",
+                        "INFO" if payload["status"] == "HEARTBEAT_OK" else "WARNING",
+                        "runtime.heartbeat",
+                        payload_json,
+                    ),
                 ),
-            )
-            # Keep compatibility with existing heartbeat history endpoint.
-            conn.execute(
-                "INSERT INTO app_heartbeat_history(status, message, context_json) VALUES (?, ?, ?)",
-                (payload["status"], payload["message"], dump_json(payload["context"])),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+                # Keep compatibility with existing heartbeat history endpoint.
+                (
+                    _SQL_INSERT_HEARTBEAT_HISTORY,
+                    (payload["status"], payload["message"], context_json),
+                ),
+            ]
+        )
 
+        self._invalidate_runtime_status()
         self._event_bus.publish("runtime", StreamEvent(event="runtime.heartbeat", data=payload))
         return payload
 
     def _on_realtime_event(self, event_type: str, payload: dict[str, Any]) -> None:
-        conn = get_conn()
-        try:
-            conn.execute(
-                "INSERT INTO app_realtime_events(event_type, payload_json) VALUES (?, ?)",
-                (event_type, dump_json(payload)),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        self.event_writer.submit(_SQL_INSERT_REALTIME_EVENT, (event_type, dump_json(payload)))
 
         self._event_bus.publish("assistant-realtime", StreamEvent(event=event_type, data=payload))
 
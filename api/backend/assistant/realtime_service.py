@@ -1,34 +1,198 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 import threading
-from datetime import datetime, timezone
-from typing import Any, Callable
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
 
 import numpy as np
 from openai import AsyncOpenAI
 
+from .._fastjson import JSONDecodeError, loads
+from ..db import now_iso
+from ._resample_kernel import LinearResampler, warm_up
 from .tools import ToolDispatcher
 
 LOG = logging.getLogger("grumpyadmin.assistant.realtime")
 
+# Realtime API PCM rate, used for both input and output audio.
+_REALTIME_SAMPLE_RATE = 24000
+
+# Captured mic chunks waiting to be sent (~160 ms at 20 ms chunks); older ones are dropped.
+_MIC_QUEUE_CHUNKS = 8
+_MIC_IDLE_POLL_SECONDS = 0.005
+# Speaker deltas are batched until at least 1/_SPEAKER_BATCHES_PER_SECOND s (20 ms) of robot-rate audio is ready.
+_SPEAKER_BATCHES_PER_SECOND = 50
+
+
+def _ev_str(event: Any, attr: str) -> str:
+    """String attribute of an SDK event, or "" when it is missing."""
+    value = getattr(event, attr, None)
+    if type(value) is str:
+        return value
+    return "" if value is None else str(value)
+
+
+def _offer_latest(chunks: asyncio.Queue[Any], item: Any) -> None:
+    """Queue ``item``, dropping the oldest chunk when full so the mic stays near real time."""
+    if chunks.full():
+        chunks.get_nowait()
+    chunks.put_nowait(item)
+
+
+def _to_int16_mono(arr: np.ndarray, gain: float) -> np.ndarray:
+    """Mix down to mono, convert to int16 and apply gain.
+
+    int16 input stays in the integer domain; other integer input is taken as int16-scaled
+    PCM and float input as [-1, 1] samples, both handled in a single float32 pass.
+    """
+    if arr.dtype == np.int16:
+        return _int16_to_mono(arr, gain)
+    is_int = np.issubdtype(arr.dtype, np.integer)
+    if arr.ndim > 1:
+        # ReSpeaker returns multi-channel input; mix down to mono for Realtime.
+        mono = arr.reshape(arr.shape[0], -1).mean(axis=1, dtype=np.float32)
+    else:
+        mono = arr.reshape(-1).astype(np.float32)
+    mono *= np.float32(gain if is_int else 32767.0 * gain)
+    np.clip(mono, -32768.0, 32767.0, out=mono)
+    return mono.astype(np.int16)
+
+
+def _int16_to_mono(arr: np.ndarray, gain: float) -> np.ndarray:
+    """Integer-only downmix plus Q15 gain, on one int32 scratch (int64 when the gain could overflow it)."""
+    frames = arr.reshape(arr.shape[0], -1) if arr.ndim > 1 else arr.reshape(-1, 1)
+    channels = frames.shape[1]
+    if channels == 1 and gain == 1.0:
+        return frames.reshape(-1)
+    acc = np.add.reduce(frames, axis=1, dtype=np.int32 if gain < 2.0 else np.int64)
+    if channels & (channels - 1) == 0:
+        acc >>= channels.bit_length() - 1
+    else:
+        acc //= channels
+    if gain != 1.0:
+        acc *= int(round(gain * (1 << 15)))
+        acc >>= 15
+        if gain > 1.0:
+            # A gain <= 1 cannot leave the int16 range.
+            np.clip(acc, -32768, 32767, out=acc)
+    return acc.astype(np.int16)
+
+
+def _copy_mic_sample(sample: Any) -> np.ndarray | None:
+    """Own copy of a captured mic chunk, or None when there is no audio in it.
+
+    Copy: drivers may reuse their buffer once they hand it over, while the chunk
+    still waits in the queue.
+    """
+    if sample is None:
+        return None
+    arr = np.array(sample)
+    return arr if arr.size else None
+
+
+def _mic_callback(loop: asyncio.AbstractEventLoop, chunks: asyncio.Queue[Any]) -> Callable[[Any], None]:
+    """Audio-driver callback that hands each captured chunk to the event loop."""
+
+    def on_audio(sample: Any) -> None:
+        arr = _copy_mic_sample(sample)
+        if arr is None:
+            return
+        try:
+            loop.call_soon_threadsafe(_offer_latest, chunks, arr)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    return on_audio
+
+
+@dataclass(frozen=True, slots=True)
+class _RobotMediaBinding:
+    """Robot media methods resolved once per robot object instead of per audio chunk."""
+
+    mini: Any
+    media: Any
+    get_audio_sample: Callable[[], Any] | None
+    set_audio_callback: Callable[[Any], Any] | None
+    start_recording: Callable[[], Any] | None
+    stop_recording: Callable[[], Any] | None
+    push_audio_sample: Callable[[Any], Any] | None
+    start_playing: Callable[[], Any] | None
+    stop_playing: Callable[[], Any] | None
+    input_sample_rate: int
+    output_sample_rate: int
+    # Playback rate the robot had before it was switched to the Realtime rate; None if unchanged.
+    original_output_sample_rate: int | None
+
+    @classmethod
+    def probe(cls, mini: Any, media: Any) -> _RobotMediaBinding:
+        input_sample_rate = 16000
+        get_input_audio_samplerate = getattr(media, "get_input_audio_samplerate", None)
+        if get_input_audio_samplerate:
+            try:
+                candidate = int(get_input_audio_samplerate())
+                if candidate > 0:
+                    input_sample_rate = candidate
+            except Exception:
+                LOG.debug("unable to read robot input sample rate", exc_info=True)
+        output_sample_rate, original_output_sample_rate = _probe_output_sample_rate(media)
+        return cls(
+            mini=mini,
+            media=media,
+            get_audio_sample=getattr(media, "get_audio_sample", None),
+            set_audio_callback=getattr(media, "set_audio_callback", None),
+            start_recording=getattr(media, "start_recording", None),
+            stop_recording=getattr(media, "stop_recording", None),
+            push_audio_sample=getattr(media, "push_audio_sample", None),
+            start_playing=getattr(media, "start_playing", None),
+            stop_playing=getattr(media, "stop_playing", None),
+            input_sample_rate=input_sample_rate,
+            output_sample_rate=output_sample_rate,
+            original_output_sample_rate=original_output_sample_rate,
+        )
 
-def _resample_int16(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
-    """Resample mono int16 audio with linear interpolation."""
-    if src_rate == dst_rate or samples.size == 0:
-        return samples.astype(np.int16, copy=False)
-    src = samples.astype(np.float32)
-    src_x = np.arange(src.shape[0], dtype=np.float32)
-    dst_len = int(round(src.shape[0] * float(dst_rate) / float(src_rate)))
-    if dst_len <= 1:
-        return samples[:1].astype(np.int16, copy=False)
-    dst_x = np.linspace(0.0, float(src.shape[0] - 1), num=dst_len, dtype=np.float32)
-    out = np.interp(dst_x, src_x, src)
-    out = np.clip(out, -32768.0, 32767.0).astype(np.int16)
-    return out
+    @property
+    def can_record(self) -> bool:
+        capture = self.set_audio_callback or self.get_audio_sample
+        return bool(capture and self.start_recording and self.stop_recording)
+
+    @property
+    def can_play(self) -> bool:
+        return bool(self.push_audio_sample and self.start_playing)
+
+
+def _read_output_sample_rate(media: Any) -> int | None:
+    get_output_audio_samplerate = getattr(media, "get_output_audio_samplerate", None)
+    if not get_output_audio_samplerate:
+        return None
+    try:
+        candidate = int(get_output_audio_samplerate())
+    except Exception:
+        LOG.debug("unable to read robot output sample rate", exc_info=True)
+        return None
+    return candidate if candidate > 0 else None
+
+
+def _probe_output_sample_rate(media: Any) -> tuple[int, int | None]:
+    """Ask the robot for 24kHz playback so Realtime audio can be pushed without resampling.
+
+    Returns the playback rate in effect and the rate to restore when the session ends.
+    """
+    original = _read_output_sample_rate(media)
+    output_sample_rate = original or 16000
+    set_output_audio_samplerate = getattr(media, "set_output_audio_samplerate", None)
+    if set_output_audio_samplerate and original != _REALTIME_SAMPLE_RATE:
+        try:
+            set_output_audio_samplerate(_REALTIME_SAMPLE_RATE)
+            output_sample_rate = _read_output_sample_rate(media) or _REALTIME_SAMPLE_RATE
+        except Exception:
+            LOG.debug("unable to set robot output sample rate", exc_info=True)
+    if original == output_sample_rate:
+        original = None
+    return output_sample_rate, original
 
 
 class OpenAIRealtimeService:
@@ -66,6 +230,17 @@ class OpenAIRealtimeService:
         self._connection: Any = None
         self._mic_task: asyncio.Task[Any] | None = None
         self._speaker_started = False
+        # Realtime PCM is 24kHz both ways; the robot side rates are probed when media is bound.
+        self._media: _RobotMediaBinding | None = None
+        self._mic_resampler: LinearResampler | None = None
+        # None while robot playback runs at the Realtime rate.
+        self._spk_resampler: LinearResampler | None = None
+        self._spk_scale = np.float32(self._output_gain / 32768.0)
+        self._spk_pending: list[np.ndarray] = []
+        self._spk_pending_samples = 0
+        # Set from the robot playback rate whenever media is bound.
+        self._spk_batch_samples = _REALTIME_SAMPLE_RATE // _SPEAKER_BATCHES_PER_SECOND
+        self._event_handlers = self._build_event_handlers()
 
     def start(self) -> dict[str, Any]:
         if not self._api_key:
@@ -74,7 +249,7 @@ class OpenAIRealtimeService:
             if self._thread and self._thread.is_alive():
                 return self.status()
             self._stop.clear()
-            self._started_at = datetime.now(timezone.utc).isoformat()
+            self._started_at = now_iso()
             self._last_error = None
             self._thread = threading.Thread(target=self._thread_main, name="assistant-realtime", daemon=True)
             self._thread.start()
@@ -113,6 +288,8 @@ class OpenAIRealtimeService:
 
     def _thread_main(self) -> None:
         try:
+            # Off the request thread, before any audio flows; robot mics are usually 16 kHz.
+            warm_up(((16000, _REALTIME_SAMPLE_RATE), (_REALTIME_SAMPLE_RATE, 16000)))
             asyncio.run(self._run())
         except Exception as exc:
             LOG.exception("Realtime thread crashed")
@@ -132,6 +309,8 @@ class OpenAIRealtimeService:
                 self._connection = conn
                 self._connected = True
                 self._emit_status()
+                # Probe robot media (and negotiate its playback rate) before audio starts flowing.
+                self._bind_media()
 
                 await conn.session.update(
                     session={
@@ -139,7 +318,7 @@ class OpenAIRealtimeService:
                         "output_modalities": ["audio"],
                         "audio": {
                             "input": {
-                                "format": {"type": "audio/pcm", "rate": 24000},
+                                "format": {"type": "audio/pcm", "rate": _REALTIME_SAMPLE_RATE},
                                 "turn_detection": {
                                     "type": "server_vad",
                                     "create_response": True,
@@ -148,7 +327,7 @@ class OpenAIRealtimeService:
                                 "transcription": {"model": "whisper-1"},
                             },
                             "output": {
-                                "format": {"type": "audio/pcm", "rate": 24000},
+                                "format": {"type": "audio/pcm", "rate": _REALTIME_SAMPLE_RATE},
                             },
                         },
                         "tools": self._tools.definitions(),
@@ -168,7 +347,7 @@ class OpenAIRealtimeService:
                 {
                     "state": "error",
                     "error": str(exc),
-                    "ts": datetime.now(timezone.utc).isoformat(),
+                    "ts": now_iso(),
                 },
             )
             LOG.exception("Realtime connection error")
@@ -177,98 +356,97 @@ class OpenAIRealtimeService:
                 self._mic_task.cancel()
                 self._mic_task = None
             self._stop_robot_playback()
+            self._release_media()
             self._connection = None
             self._connected = False
             self._emit_status()
 
     async def _handle_event(self, conn: Any, event: Any) -> None:
-        etype = str(getattr(event, "type", "") or "")
-
-        if etype == "conversation.item.input_audio_transcription.completed":
-            transcript = str(getattr(event, "transcript", "") or "")
-            if transcript:
-                self._on_event(
-                    "assistant.realtime.transcript",
-                    {
-                        "role": "user",
-                        "content": transcript,
-                        "ts": datetime.now(timezone.utc).isoformat(),
-                    },
-                )
-            return
+        handler = self._event_handlers.get(_ev_str(event, "type"))
+        if handler is not None:
+            await handler(conn, event)
+
+    def _build_event_handlers(self) -> dict[str, Callable[[Any, Any], Awaitable[None]]]:
+        return {
+            "conversation.item.input_audio_transcription.completed": self._on_user_transcript,
+            "response.audio_transcript.done": self._on_assistant_transcript,
+            "response.output_audio_transcript.done": self._on_assistant_transcript,
+            "response.audio.delta": self._on_audio_delta,
+            "response.output_audio.delta": self._on_audio_delta,
+            "response.audio.done": self._on_audio_done,
+            "response.output_audio.done": self._on_audio_done,
+            "response.text.done": self._on_text_done,
+            "response.output_text.done": self._on_text_done,
+            "response.function_call_arguments.done": self._on_function_call_done,
+            # Compatibility fallback for older event shape.
+            "conversation.item.added": self._on_item_added,
+            "error": self._on_error,
+        }
 
-        if etype in {"response.audio_transcript.done", "response.output_audio_transcript.done"}:
-            transcript = str(getattr(event, "transcript", "") or "")
-            if transcript:
-                self._on_event(
-                    "assistant.realtime.transcript",
-                    {
-                        "role": "assistant",
-                        "content": transcript,
-                        "ts": datetime.now(timezone.utc).isoformat(),
-                    },
-                )
-            return
+    def _emit_transcript(self, role: str, content: str) -> None:
+        if content:
+            self._on_event(
+                "assistant.realtime.transcript",
+                {
+                    "role": role,
+                    "content": content,
+                    "ts": now_iso(),
+                },
+            )
 
-        if etype in {"response.audio.delta", "response.output_audio.delta"}:
-            delta = getattr(event, "delta", None)
-            if delta:
-                self._play_robot_audio(str(delta))
-            return
+    async def _on_user_transcript(self, conn: Any, event: Any) -> None:
+        self._emit_transcript("user", _ev_str(event, "transcript"))
 
-        if etype in {"response.text.done", "response.output_text.done"}:
-            text = str(getattr(event, "text", "") or "")
-            if text:
-                self._on_event(
-                    "assistant.realtime.transcript",
-                    {
-                        "role": "assistant",
-                        "content": text,
-                        "ts": datetime.now(timezone.utc).isoformat(),
-                    },
-                )
-            return
+    async def _on_assistant_transcript(self, conn: Any, event: Any) -> None:
+        self._emit_transcript("assistant", _ev_str(event, "transcript"))
+
+    async def _on_text_done(self, conn: Any, event: Any) -> None:
+        self._emit_transcript("assistant", _ev_str(event, "text"))
+
+    async def _on_audio_delta(self, conn: Any, event: Any) -> None:
+        delta = _ev_str(event, "delta")
+        if delta:
+            self._play_robot_audio(delta)
 
-        if etype == "response.function_call_arguments.done":
+    async def _on_audio_done(self, conn: Any, event: Any) -> None:
+        self._flush_robot_audio()
+
+    async def _on_function_call_done(self, conn: Any, event: Any) -> None:
+        await self._dispatch_tool_call(
+            conn=conn,
+            name=_ev_str(event, "name"),
+            arguments=_ev_str(event, "arguments") or "{}",
+            call_id=_ev_str(event, "call_id"),
+        )
+
+    async def _on_item_added(self, conn: Any, event: Any) -> None:
+        item = getattr(event, "item", None)
+        if item and _ev_str(item, "type") == "function_call":
             await self._dispatch_tool_call(
                 conn=conn,
-                name=str(getattr(event, "name", "") or ""),
-                arguments=str(getattr(event, "arguments", "") or "{}"),
-                call_id=str(getattr(event, "call_id", "") or ""),
+                name=_ev_str(item, "name"),
+                arguments=_ev_str(item, "arguments") or "{}",
+                call_id=_ev_str(item, "call_id") or _ev_str(item, "id"),
             )
-            return
 
-        # Compatibility fallback for older event shape.
-        if etype == "conversation.item.added":
-            item = getattr(event, "item", None)
-            if item and str(getattr(item, "type", "")) == "function_call":
-                await self._dispatch_tool_call(
-                    conn=conn,
-                    name=str(getattr(item, "name", "") or ""),
-                    arguments=str(getattr(item, "arguments", "") or "{}"),
-                    call_id=str(getattr(item, "call_id", "") or getattr(item, "id", "") or ""),
-                )
-            return
-
-        if etype == "error":
-            message = str(getattr(event, "error", "") or "")
-            self._on_event(
-                "assistant.realtime.status",
-                {
-                    "state": "error",
-                    "error": message,
-                    "ts": datetime.now(timezone.utc).isoformat(),
-                },
-            )
+    async def _on_error(self, conn: Any, event: Any) -> None:
+        self._on_event(
+            "assistant.realtime.status",
+            {
+                "state": "error",
+                "error": _ev_str(event, "error"),
+                "ts": now_iso(),
+            },
+        )
 
     async def _dispatch_tool_call(self, conn: Any, name: str, arguments: str, call_id: str) -> None:
         if not call_id:
             return
         try:
-            parsed = json.loads(arguments) if arguments.strip() else {}
-        except json.JSONDecodeError:
+            parsed = loads(arguments) if arguments.strip() else {}
+        except JSONDecodeError:
             parsed = {}
-        result = self._tools.execute(name, parsed)
+        tool_result = self._tools.execute(name, parsed)
 
         self._on_event(
             "assistant.tool",
@@ -276,8 +454,8 @@ class OpenAIRealtimeService:
                 "call_id": call_id,
                 "name": name,
                 "arguments": parsed,
-                "result": result,
-                "ts": datetime.now(timezone.utc).isoformat(),
+                "result": tool_result.result,
+                "ts": now_iso(),
             },
         )
 
@@ -285,110 +463,154 @@ class OpenAIRealtimeService:
             item={
                 "type": "function_call_output",
                 "call_id": call_id,
-                "output": json.dumps(result, ensure_ascii=True),
+                "output": tool_result.output,
             }
         )
         await conn.response.create()
 
     async def _pump_robot_microphone(self, conn: Any) -> None:
+        loop = asyncio.get_running_loop()
         while not self._stop.is_set():
-            mini = self._get_robot_mini()
-            media = getattr(mini, "media", None) if mini else None
-            if not media:
+            media = self._bind_media()
+            if media is None or not media.can_record:
                 await asyncio.sleep(0.25)
                 continue
+            get_audio_sample = media.get_audio_sample
+            set_audio_callback = media.set_audio_callback
+            stop_recording = media.stop_recording
 
-            get_audio_sample = getattr(media, "get_audio_sample", None)
-            start_recording = getattr(media, "start_recording", None)
-            stop_recording = getattr(media, "stop_recording", None)
-            get_input_audio_samplerate = getattr(media, "get_input_audio_samplerate", None)
-            if not get_audio_sample or not start_recording or not stop_recording:
-                await asyncio.sleep(0.25)
-                continue
-
-            input_sample_rate = 16000
-            if get_input_audio_samplerate:
-                try:
-                    candidate = int(get_input_audio_samplerate())
-                    if candidate > 0:
-                        input_sample_rate = candidate
-                except Exception:
-                    LOG.debug("unable to read robot input sample rate", exc_info=True)
+            input_sample_rate = media.input_sample_rate
+            if self._mic_resampler is None or self._mic_resampler.src_rate != input_sample_rate:
+                self._mic_resampler = LinearResampler(input_sample_rate, _REALTIME_SAMPLE_RATE)
+            mic_resampler = self._mic_resampler
 
+            chunks: asyncio.Queue[Any] = asyncio.Queue(maxsize=_MIC_QUEUE_CHUNKS)
+            capture_stop = threading.Event()
             try:
-                start_recording()
+                if set_audio_callback:
+                    # The driver pushes chunks as they are captured; no polling at all.
+                    set_audio_callback(_mic_callback(loop, chunks))
+                media.start_recording()
+                if not set_audio_callback:
+                    threading.Thread(
+                        target=self._capture_robot_microphone,
+                        args=(get_audio_sample, loop, chunks, capture_stop),
+                        name="assistant-realtime-mic",
+                        daemon=True,
+                    ).start()
                 while not self._stop.is_set():
-                    sample = get_audio_sample()
-                    if sample is None:
-                        await asyncio.sleep(0.02)
-                        continue
-                    arr = np.asarray(sample)
-                    if arr.size == 0:
-                        await asyncio.sleep(0.02)
-                        continue
-                    if arr.ndim > 1:
-                        # ReSpeaker returns multi-channel input; mix down to mono for Realtime.
-                        arr = np.mean(arr.astype(np.float32), axis=1)
-                    else:
-                        arr = arr.reshape(-1)
-                    if arr.dtype != np.int16:
-                        if np.issubdtype(arr.dtype, np.integer):
-                            arr = np.clip(arr.astype(np.int32), -32768, 32767).astype(np.int16)
-                        else:
-                            arr = np.clip(arr.astype(np.float32), -1.0, 1.0)
-                            arr = (arr * 32767.0).astype(np.int16)
-                    if self._input_gain != 1.0:
-                        boosted = arr.astype(np.float32) * self._input_gain
-                        arr = np.clip(boosted, -32768.0, 32767.0).astype(np.int16)
+                    # Woken as soon as a chunk is captured; no fixed pacing.
+                    item = await chunks.get()
+                    if item is None:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    arr = _to_int16_mono(item, self._input_gain)
                     # Realtime PCM input expects 24kHz mono.
-                    arr = _resample_int16(arr, src_rate=input_sample_rate, dst_rate=24000)
-                    b64 = base64.b64encode(arr.tobytes()).decode("utf-8")
+                    arr = mic_resampler.process(arr)
+                    # Encode straight from the resampler buffer; no tobytes() copy.
+                    b64 = binascii.b2a_base64(memoryview(arr).cast("B"), newline=False).decode("ascii")
                     await conn.input_audio_buffer.append(audio=b64)
-                    await asyncio.sleep(0.02)
             except asyncio.CancelledError:
                 return
             except Exception:
                 LOG.debug("robot microphone bridge unavailable", exc_info=True)
                 await asyncio.sleep(0.5)
             finally:
+                capture_stop.set()
                 try:
                     stop_recording()
                 except Exception:
                     pass
+                if set_audio_callback:
+                    try:
+                        set_audio_callback(None)
+                    except Exception:
+                        LOG.debug("unable to clear robot audio callback", exc_info=True)
+
+    def _capture_robot_microphone(
+        self,
+        get_audio_sample: Callable[[], Any],
+        loop: asyncio.AbstractEventLoop,
+        chunks: asyncio.Queue[Any],
+        capture_stop: threading.Event,
+    ) -> None:
+        """Read mic chunks on a dedicated thread and hand them to the event loop.
+
+        Ends by queueing None, or the exception that stopped capture.
+        """
+        end: BaseException | None = None
+        try:
+            while not self._stop.is_set() and not capture_stop.is_set():
+                arr = _copy_mic_sample(get_audio_sample())
+                if arr is None:
+                    time.sleep(_MIC_IDLE_POLL_SECONDS)
+                    continue
+                loop.call_soon_threadsafe(_offer_latest, chunks, arr)
+        except Exception as exc:
+            end = exc
+        try:
+            loop.call_soon_threadsafe(_offer_latest, chunks, end)
+        except RuntimeError:
+            pass  # event loop already closed
 
     def _play_robot_audio(self, delta_b64: str) -> None:
-        mini = self._get_robot_mini()
-        media = getattr(mini, "media", None) if mini else None
-        if not media:
-            return
-        push_audio_sample = getattr(media, "push_audio_sample", None)
-        start_playing = getattr(media, "start_playing", None)
-        if not push_audio_sample or not start_playing:
+        media = self._bind_media()
+        if media is None or not media.can_play:
             return
 
         try:
-            if not self._speaker_started and hasattr(media, "start_playing"):
-                start_playing()
+            # can_play already guarantees start_playing is bound.
+            if not self._speaker_started:
+                media.start_playing()
                 self._speaker_started = True
-            raw = base64.b64decode(delta_b64)
-            int16_audio = np.frombuffer(raw, dtype=np.int16)
+            # Decode without the base64-module wrapper; frombuffer is a zero-copy view of it.
+            raw = binascii.a2b_base64(delta_b64)
+            int16_audio = np.frombuffer(raw, dtype=np.int16, count=len(raw) // 2)
             if int16_audio.size == 0:
                 return
-            # Realtime output PCM is 24kHz; robot media expects 16kHz float32.
-            int16_audio = _resample_int16(int16_audio, src_rate=24000, dst_rate=16000)
-            float_audio = int16_audio.astype(np.float32) / 32768.0
-            if self._output_gain != 1.0:
-                float_audio = np.clip(float_audio * self._output_gain, -1.0, 1.0)
-            float_audio = float_audio.reshape(-1, 1)
-            push_audio_sample(float_audio)
+            # Realtime output PCM is 24kHz; resample only if the robot could not be set to match.
+            if self._spk_resampler is not None:
+                int16_audio = self._spk_resampler.process(int16_audio)
+            # Convert and apply gain in one pass. A fresh array per delta: it waits in the batch,
+            # and the media backend may hold on to what it is given.
+            float_audio = np.empty(int16_audio.shape[0], dtype=np.float32)
+            np.multiply(int16_audio, self._spk_scale, out=float_audio)
+            if self._output_gain > 1.0:
+                # Only a boost can leave [-1, 1]; int16 scaled by <= 1/32768 cannot.
+                np.clip(float_audio, -1.0, 1.0, out=float_audio)
+            self._spk_pending.append(float_audio)
+            self._spk_pending_samples += float_audio.shape[0]
+            if self._spk_pending_samples >= self._spk_batch_samples:
+                self._flush_robot_audio(media)
+        except Exception:
+            self._speaker_started = False
+            LOG.debug("robot speaker bridge unavailable", exc_info=True)
+
+    def _flush_robot_audio(self, media: _RobotMediaBinding | None = None) -> None:
+        """Push batched speaker audio to the robot as one (N, 1) float32 block."""
+        pending = self._spk_pending
+        if not pending:
+            return
+        self._spk_pending = []
+        self._spk_pending_samples = 0
+        media = media or self._bind_media()
+        if media is None or not media.can_play:
+            return
+        block = pending[0] if len(pending) == 1 else np.concatenate(pending)
+        try:
+            media.push_audio_sample(block.reshape(-1, 1))
         except Exception:
             self._speaker_started = False
             LOG.debug("robot speaker bridge unavailable", exc_info=True)
 
     def _stop_robot_playback(self) -> None:
-        mini = self._get_robot_mini()
-        media = getattr(mini, "media", None) if mini else None
-        stop_playing = getattr(media, "stop_playing", None) if media else None
+        # Playback is being cut off; batched audio that has not been pushed is dropped.
+        self._spk_pending = []
+        self._spk_pending_samples = 0
+        # The binding in use, if any; binding anew here would renegotiate the playback rate.
+        media = self._media
+        stop_playing = media.stop_playing if media else None
         if not stop_playing:
             self._speaker_started = False
             return
@@ -399,10 +621,42 @@ class OpenAIRealtimeService:
         finally:
             self._speaker_started = False
 
+    def _bind_media(self) -> _RobotMediaBinding | None:
+        """Return the robot media methods, looked up again only when the robot object changes."""
+        mini = self._get_robot_mini()
+        binding = self._media
+        if binding is not None and binding.mini is mini:
+            return binding
+        media = getattr(mini, "media", None) if mini else None
+        self._media = _RobotMediaBinding.probe(mini, media) if media else None
+        output_sample_rate = self._media.output_sample_rate if self._media else _REALTIME_SAMPLE_RATE
+        self._spk_batch_samples = output_sample_rate // _SPEAKER_BATCHES_PER_SECOND
+        self._spk_resampler = (
+            None
+            if output_sample_rate == _REALTIME_SAMPLE_RATE
+            else LinearResampler(_REALTIME_SAMPLE_RATE, output_sample_rate)
+        )
+        return self._media
+
+    def _release_media(self) -> None:
+        """Drop the media binding and give the robot back the playback rate it had before."""
+        binding = self._media
+        self._media = None
+        self._spk_resampler = None
+        if binding is None or binding.original_output_sample_rate is None:
+            return
+        set_output_audio_samplerate = getattr(binding.media, "set_output_audio_samplerate", None)
+        if not set_output_audio_samplerate:
+            return
+        try:
+            set_output_audio_samplerate(binding.original_output_sample_rate)
+        except Exception:
+            LOG.debug("unable to restore robot output sample rate", exc_info=True)
+
     def _emit_status(self) -> None:
         payload = {
             "state": "running" if self._connected else "stopped",
             "status": self.status(),
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": now_iso(),
         }
         self._on_event("assistant.realtime.status", payload)
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
-import json
 import logging
 from collections.abc import Generator
 from typing import Any
 
 from openai import OpenAI
 
+from .._fastjson import JSONDecodeError, loads
 from .tools import ToolDispatcher
 
 LOG = logging.getLogger("grumpyadmin.assistant.text")
 
 
+class _ToolCall:
+    """One function call collected from a response stream."""
+
+    __slots__ = ("call_id", "name", "arguments")
+
+    def __init__(self, call_id: str, name: str, arguments: str):
+        self.call_id = call_id
+        self.name = name
+        self.arguments = arguments
+
+
 class OpenAITextGateway:
     """Responses API text gateway with tool-call loop."""
 
+    _VALID_ROLES = frozenset({"user", "assistant", "developer"})
+
     def __init__(
         self,
         api_key: str,
@@ -43,16 +56,17 @@ class OpenAITextGateway:
             raise ValueError("OPENAI_API_KEY is required for assistant text replies")
 
         input_items = self._to_input_items(messages)
+        tools = self._tools.definitions()
         previous_response_id: str | None = None
 
         for round_no in range(max_rounds):
-            tool_calls: dict[str, dict[str, str]] = {}
+            tool_calls: dict[str, _ToolCall] = {}
 
             kwargs: dict[str, Any] = {
                 "model": self._model,
                 "instructions": instructions,
                 "input": input_items,
-                "tools": self._tools.definitions(),
+                "tools": tools,
                 "tool_choice": "auto",
             }
             if previous_response_id:
@@ -70,11 +84,11 @@ class OpenAITextGateway:
                     if etype == "response.function_call_arguments.done":
                         call_id = str(getattr(event, "call_id", "") or "")
                         if call_id:
-                            tool_calls[call_id] = {
-                                "call_id": call_id,
-                                "name": str(getattr(event, "name", "") or ""),
-                                "arguments": str(getattr(event, "arguments", "") or "{}"),
-                            }
+                            tool_calls[call_id] = _ToolCall(
+                                call_id,
+                                str(getattr(event, "name", "") or ""),
+                                str(getattr(event, "arguments", "") or "{}"),
+                            )
                         continue
 
                     # Compatibility: sometimes function_call appears as output item.
@@ -83,11 +97,11 @@ class OpenAITextGateway:
                         if item and getattr(item, "type", "") == "function_call":
                             call_id = str(getattr(item, "call_id", "") or "")
                             if call_id and call_id not in tool_calls:
-                                tool_calls[call_id] = {
-                                    "call_id": call_id,
-                                    "name": str(getattr(item, "name", "") or ""),
-                                    "arguments": str(getattr(item, "arguments", "") or "{}"),
-                                }
+                                tool_calls[call_id] = _ToolCall(
+                                    call_id,
+                                    str(getattr(item, "name", "") or ""),
+                                    str(getattr(item, "arguments", "") or "{}"),
+                                )
 
                 final = stream.get_final_response()
 
@@ -98,25 +112,25 @@ class OpenAITextGateway:
 
             next_inputs: list[dict[str, Any]] = []
             for call in tool_calls.values():
-                raw_args = call["arguments"] or "{}"
+                raw_args = call.arguments or "{}"
                 try:
-                    parsed_args = json.loads(raw_args)
-                except json.JSONDecodeError:
+                    parsed_args = loads(raw_args)
+                except JSONDecodeError:
                     parsed_args = {}
 
-                result = self._tools.execute(call["name"], parsed_args)
+                tool_result = self._tools.execute(call.name, parsed_args)
                 yield {
                     "type": "tool",
-                    "call_id": call["call_id"],
-                    "name": call["name"],
+                    "call_id": call.call_id,
+                    "name": call.name,
                     "arguments": parsed_args,
-                    "result": result,
+                    "result": tool_result.result,
                 }
                 next_inputs.append(
                     {
                         "type": "function_call_output",
-                        "call_id": call["call_id"],
-                        "output": json.dumps(result, ensure_ascii=True),
+                        "call_id": call.call_id,
+                        "output": tool_result.output,
                     }
                 )
 
@@ -134,15 +148,22 @@ class OpenAITextGateway:
         self._client = OpenAI(**kwargs)
         return self._client
 
-    @staticmethod
-    def _to_input_items(messages: list[dict[str, Any]]) -> list[dict[str, str]]:
+    @classmethod
+    def _to_input_items(cls, messages: list[dict[str, Any]]) -> list[dict[str, str]]:
+        # History rows already carry clean lowercase roles and str content; only
+        # fall back to normalizing when a message does not.
+        valid_roles = cls._VALID_ROLES
         out: list[dict[str, str]] = []
         for msg in messages:
-            role = str(msg.get("role", "user") or "user").strip().lower()
-            content = str(msg.get("content", "") or "")
+            content = msg.get("content")
+            if type(content) is not str:
+                content = str(content or "")
             if not content:
                 continue
-            if role not in {"user", "assistant", "developer"}:
-                role = "user"
+            role = msg.get("role", "user")
+            if type(role) is not str or role not in valid_roles:
+                role = str(role or "user").strip().lower()
+                if role not in valid_roles:
+                    role = "user"
             out.append({"role": role, "content": content})
         return out
@@ -1,80 +1,99 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import cached_property
+from typing import Any, NamedTuple
 
-from grumpyclaw.memory.retriever import Retriever
+from grumpyclaw.memory.retriever import Retriever, get_retriever
 from grumpyclaw.skills.registry import get_skill_content
 
+from .._fastjson import dumps_str
+
+_TOOL_DEFINITIONS: list[dict[str, Any]] = [
+    {
+        "type": "function",
+        "name": "search_memory",
+        "description": "Search memory chunks by semantic + keyword hybrid search.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string"},
+                "top_k": {"type": "integer", "minimum": 1, "maximum": 20},
+            },
+            "required": ["query"],
+        },
+    },
+    {
+        "type": "function",
+        "name": "run_skill",
+        "description": "Load local SKILL.md content by skill id.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "skill_id": {"type": "string"},
+            },
+            "required": ["skill_id"],
+        },
+    },
+    {
+        "type": "function",
+        "name": "robot_action",
+        "description": "Queue a robot action in the in-process robot runtime.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["nod", "look_at", "antenna_feedback", "speak"],
+                },
+                "x": {"type": "number"},
+                "y": {"type": "number"},
+                "z": {"type": "number"},
+                "duration": {"type": "number"},
+                "state": {
+                    "type": "string",
+                    "enum": ["attention", "success", "error", "neutral"],
+                },
+                "text": {"type": "string"},
+                "confirm": {"type": "boolean"},
+            },
+            "required": ["action"],
+        },
+    },
+]
+
+
+class ToolResult(NamedTuple):
+    """Tool result dict plus its JSON form, serialized once for function_call_output."""
+
+    result: dict[str, Any]
+    output: str
+
 
 class ToolDispatcher:
     """Unified tool execution for Responses and Realtime."""
 
     def __init__(self, robot_service: Any):
         self._robot_service = robot_service
-        self._retriever = Retriever()
+
+    @cached_property
+    def retriever(self) -> Retriever:
+        """Resolved on the first search_memory call; sessions that never search skip it."""
+        return get_retriever()
 
     def definitions(self) -> list[dict[str, Any]]:
-        return [
-            {
-                "type": "function",
-                "name": "search_memory",
-                "description": "Search memory chunks by semantic + keyword hybrid search.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string"},
-                        "top_k": {"type": "integer", "minimum": 1, "maximum": 20},
-                    },
-                    "required": ["query"],
-                },
-            },
-            {
-                "type": "function",
-                "name": "run_skill",
-                "description": "Load local SKILL.md content by skill id.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "skill_id": {"type": "string"},
-                    },
-                    "required": ["skill_id"],
-                },
-            },
-            {
-                "type": "function",
-                "name": "robot_action",
-                "description": "Queue a robot action in the in-process robot runtime.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "action": {
-                            "type": "string",
-                            "enum": ["nod", "look_at", "antenna_feedback", "speak"],
-                        },
-                        "x": {"type": "number"},
-                        "y": {"type": "number"},
-                        "z": {"type": "number"},
-                        "duration": {"type": "number"},
-                        "state": {
-                            "type": "string",
-                            "enum": ["attention", "success", "error", "neutral"],
-                        },
-                        "text": {"type": "string"},
-                        "confirm": {"type": "boolean"},
-                    },
-                    "required": ["action"],
-                },
-            },
-        ]
+        # Built once at import; callers only read it.
+        return _TOOL_DEFINITIONS
 
-    def execute(self, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    def execute(self, name: str, arguments: dict[str, Any]) -> ToolResult:
         if name == "search_memory":
-            return self._search_memory(arguments)
-        if name == "run_skill":
-            return self._run_skill(arguments)
-        if name == "robot_action":
-            return self._robot_action(arguments)
-        return {"ok": False, "error": f"Unknown tool: {name}"}
+            result = self._search_memory(arguments)
+        elif name == "run_skill":
+            result = self._run_skill(arguments)
+        elif name == "robot_action":
+            result = self._robot_action(arguments)
+        else:
+            result = {"ok": False, "error": f"Unknown tool: {name}"}
+        return ToolResult(result, dumps_str(result))
 
     def _search_memory(self, arguments: dict[str, Any]) -> dict[str, Any]:
         query = str(arguments.get("query", "")).strip()
@@ -83,7 +102,7 @@ class ToolDispatcher:
         top_k = int(arguments.get("top_k", 5) or 5)
         top_k = max(1, min(20, top_k))
         try:
-            hits = self._retriever.hybrid_search(query=query, top_k=top_k)
+            hits = self.retriever.hybrid_search(query=query, top_k=top_k)
             return {"ok": True, "result": hits}
         except Exception as exc:
             return {"ok": False, "error": str(exc)}
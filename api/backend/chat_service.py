@@ -1,145 +1,167 @@
 from __future__ import annotations
 
 import threading
-import uuid
-from datetime import datetime, timezone
-from typing import Any
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
 
 from grumpyclaw.llm.client import chat as llm_chat
-from grumpyclaw.memory.retriever import Retriever
-from grumpyclaw.skills.registry import list_skills
+from grumpyclaw.memory.retriever import get_retriever
+from grumpyclaw.skills.registry import cached_skills
 from grumpyreachy.tool_adapter import GrumpyClawToolAdapter
 
-from .db import dump_json, get_conn, load_json
+from .db import dump_json, load_json, new_id, now_iso, read_conn, write_conn
 from .event_bus import EventBus, StreamEvent
+from .reply_cache import ReplyCache, history_scope
 from .robot_service import ApiFeedbackBridge
 
+# Streamed tokens are coalesced into one chat.token event per window.
+_TOKEN_FLUSH_SECONDS = 0.02
+_TOKEN_FLUSH_COUNT = 32
+# The running reply is also saved to its row every so many tokens or seconds, so a crash keeps the progress.
+_PARTIAL_SAVE_TOKENS = 256
+_PARTIAL_SAVE_SECONDS = 1.0
+# meta_json values, serialized once.
+_EMPTY_META_JSON = dump_json({})
+_STREAMING_META_JSON = dump_json({"streaming": True})
+_FINAL_META_JSON = dump_json({"streaming": False})
+# Replies generated concurrently; further turns queue behind them.
+_REPLY_WORKERS = 8
+# Sessions whose prompt history is kept in memory between turns.
+_SESSION_CACHE_SIZE = 128
+
+_SQL_INSERT_SESSION = "INSERT INTO app_chat_sessions(id, mode, title, created_at, updated_at) VALUES (?, ?, ?, ?, ?)"
+_SQL_LIST_SESSIONS = """
+    SELECT id, mode, title, created_at, updated_at
+    FROM app_chat_sessions
+    ORDER BY updated_at DESC
+    LIMIT ? OFFSET ?
+"""
+_SQL_LIST_SESSIONS_BY_MODE = """
+    SELECT id, mode, title, created_at, updated_at
+    FROM app_chat_sessions
+    WHERE mode = ?
+    ORDER BY updated_at DESC
+    LIMIT ? OFFSET ?
+"""
+_SQL_LIST_MESSAGES = """
+    SELECT id, session_id, role, content, status, created_at, meta_json
+    FROM app_chat_messages
+    WHERE session_id = ?
+    ORDER BY created_at ASC, rowid ASC
+"""
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+# Touches the session and reads its mode in one statement; no row means no such session.
+_SQL_TOUCH_SESSION_MODE = "UPDATE app_chat_sessions SET updated_at = ? WHERE id = ? RETURNING mode"
+_SQL_FINALIZE_MESSAGE = "UPDATE app_chat_messages SET content = ?, status = ?, meta_json = ? WHERE id = ?"
+_SQL_SAVE_PARTIAL_MESSAGE = "UPDATE app_chat_messages SET content = ? WHERE id = ?"
+_SQL_HISTORY_FOR_LLM = """
+    SELECT id, role, content
+    FROM app_chat_messages
+    WHERE session_id = ? AND role IN ('user', 'assistant') AND content != '' AND status != 'processing'
+    ORDER BY rowid ASC
+"""
+
 
 def _system_prompt() -> str:
+    try:
+        skills = tuple((skill["name"], skill["id"]) for skill in cached_skills())
+    except Exception:
+        skills = ()
+    return _render_system_prompt(skills)
+
+
+@lru_cache(maxsize=8)
+def _render_system_prompt(skills: tuple[tuple[str, str], ...]) -> str:
     parts = [
         "You are a helpful personal AI assistant. Use memory and skill context when relevant.",
     ]
-    try:
-        skills = list_skills()
-        if skills:
-            parts.append("Available skills:")
-            for skill in skills:
-                parts.append(f"- {skill['name']}: {skill['id']}")
-    except Exception:
-        pass
+    if skills:
+        parts.append("Available skills:")
+        for name, skill_id in skills:
+            parts.append(f"- {name}: {skill_id}")
     return "\n".join(parts)
 
 
+def _iter_history_for_llm(rows: Iterable[tuple[Any, ...]], ids: set[str]) -> Iterator[dict[str, str]]:
+    """Stream (id, role, content) rows into prompt messages, collecting the row ids into ``ids``."""
+    for row_id, role, content in rows:
+        ids.add(row_id)
+        yield {"role": role, "content": content}
+
+
 class ChatService:
     def __init__(self, event_bus: EventBus, feedback_bridge: ApiFeedbackBridge):
         self._event_bus = event_bus
-        self._retriever = Retriever()
+        self._retriever = get_retriever()
+        self._reply_cache = ReplyCache(self._retriever.embed)
         self._adapter = GrumpyClawToolAdapter(feedback=feedback_bridge)
         self._system = _system_prompt()
+        # session_id -> (user/assistant turns, ids of the messages they came from), LRU order.
+        self._session_cache: OrderedDict[str, tuple[list[dict[str, str]], set[str]]] = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+        self._reply_pool = ThreadPoolExecutor(max_workers=_REPLY_WORKERS, thread_name_prefix="chat-reply")
+
+    def shutdown(self) -> None:
+        self._reply_pool.shutdown(wait=False, cancel_futures=True)
 
     def create_session(self, mode: str, title: str | None = None) -> dict[str, Any]:
-        session_id = str(uuid.uuid4())
-        ts = datetime.now(timezone.utc).isoformat()
-        conn = get_conn()
-        try:
-            conn.execute(
-                "INSERT INTO app_chat_sessions(id, mode, title, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
-                (session_id, mode, title or f"{mode} session", ts, ts),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        session_id = new_id()
+        ts = now_iso()
+        with write_conn() as conn:
+            conn.execute(_SQL_INSERT_SESSION, (session_id, mode, title or f"{mode} session", ts, ts))
+        with self._session_cache_lock:
+            self._cache_session(session_id, [], set())
         return {"session_id": session_id, "mode": mode, "created_at": ts}
 
     def list_sessions(self, mode: str | None = None, limit: int = 50, offset: int = 0) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
+        with read_conn() as conn:
             if mode:
-                rows = conn.execute(
-                    """
-                    SELECT id, mode, title, created_at, updated_at
-                    FROM app_chat_sessions
-                    WHERE mode = ?
-                    ORDER BY datetime(updated_at) DESC
-                    LIMIT ? OFFSET ?
-                    """,
-                    (mode, limit, offset),
-                ).fetchall()
+                rows = conn.execute(_SQL_LIST_SESSIONS_BY_MODE, (mode, limit, offset)).fetchall()
             else:
-                rows = conn.execute(
-                    """
-                    SELECT id, mode, title, created_at, updated_at
-                    FROM app_chat_sessions
-                    ORDER BY datetime(updated_at) DESC
-                    LIMIT ? OFFSET ?
-                    """,
-                    (limit, offset),
-                ).fetchall()
-            return [dict(row) for row in rows]
-        finally:
-            conn.close()
+                rows = conn.execute(_SQL_LIST_SESSIONS, (limit, offset)).fetchall()
+        return [dict(row) for row in rows]
 
     def list_messages(self, session_id: str) -> list[dict[str, Any]]:
-        conn = get_conn()
-        try:
-            rows = conn.execute(
-                """
-                SELECT id, session_id, role, content, status, created_at, meta_json
-                FROM app_chat_messages
-                WHERE session_id = ?
-                ORDER BY datetime(created_at) ASC, id ASC
-                """,
-                (session_id,),
-            ).fetchall()
-            return [
-                {
-                    "id": row["id"],
-                    "session_id": row["session_id"],
-                    "role": row["role"],
-                    "content": row["content"],
-                    "status": row["status"],
-                    "created_at": row["created_at"],
-                    "meta": load_json(row["meta_json"]),
-                }
-                for row in rows
-            ]
-        finally:
-            conn.close()
+        with read_conn() as conn:
+            rows = conn.execute(_SQL_LIST_MESSAGES, (session_id,)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "session_id": row["session_id"],
+                "role": row["role"],
+                "content": row["content"],
+                "status": row["status"],
+                "created_at": row["created_at"],
+                "meta": load_json(row["meta_json"]),
+            }
+            for row in rows
+        ]
 
     def enqueue_user_message(self, session_id: str, content: str) -> dict[str, Any]:
-        user_id = str(uuid.uuid4())
-        assistant_id = str(uuid.uuid4())
-        ts = datetime.now(timezone.utc).isoformat()
-        conn = get_conn()
-        try:
-            session = conn.execute("SELECT mode FROM app_chat_sessions WHERE id = ?", (session_id,)).fetchone()
+        user_id = new_id()
+        assistant_id = new_id()
+        ts = now_iso()
+        with write_conn() as conn:
+            session = conn.execute(_SQL_TOUCH_SESSION_MODE, (ts, session_id)).fetchone()
             if not session:
                 raise ValueError("session not found")
-            conn.execute(
-                """
-                INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
-                VALUES (?, ?, 'user', ?, 'final', ?, ?)
-                """,
-                (user_id, session_id, content, ts, dump_json({})),
-            )
-            conn.execute(
-                """
-                INSERT INTO app_chat_messages(id, session_id, role, content, status, created_at, meta_json)
-                VALUES (?, ?, 'assistant', '', 'processing', ?, ?)
-                """,
-                (assistant_id, session_id, ts, dump_json({"streaming": True})),
+            conn.executemany(
+                _SQL_INSERT_MESSAGE,
+                (
+                    (user_id, session_id, "user", content, "final", ts, _EMPTY_META_JSON),
+                    (assistant_id, session_id, "assistant", "", "processing", ts, _STREAMING_META_JSON),
+                ),
             )
-            conn.execute("UPDATE app_chat_sessions SET updated_at = ? WHERE id = ?", (ts, session_id))
-            conn.commit()
             mode = str(session["mode"])
-        finally:
-            conn.close()
-
-        threading.Thread(
-            target=self._process_assistant_reply,
-            args=(session_id, assistant_id, content, mode),
-            daemon=True,
-        ).start()
+        self._remember_message(session_id, user_id, "user", content)
+
+        self._reply_pool.submit(self._process_assistant_reply, session_id, assistant_id, content, mode)
         return {"message_id": assistant_id, "queued": True}
 
     def _process_assistant_reply(self, session_id: str, assistant_id: str, user_text: str, mode: str) -> None:
@@ -153,25 +175,40 @@ class ChatService:
                 f"chat:{session_id}",
                 StreamEvent(event="chat.error", data={"session_id": session_id, "error": str(exc)}),
             )
-            self._set_assistant_final(assistant_id, f"Error: {exc}", status="error")
+            self._set_assistant_final(session_id, assistant_id, f"Error: {exc}", status="error")
 
     def _reply_grumpyreachy(self, session_id: str, assistant_id: str, user_text: str) -> None:
         out = self._adapter.ask(prompt=user_text)
         if not out.get("ok"):
             raise RuntimeError(str(out.get("error", "unknown error")))
         final = str(out.get("result", ""))
-        self._set_assistant_final(assistant_id, final)
+        self._set_assistant_final(session_id, assistant_id, final)
         self._event_bus.publish(
             f"chat:{session_id}",
             StreamEvent(event="chat.final", data={"session_id": session_id, "message_id": assistant_id, "content": final}),
         )
 
     def _reply_grumpyclaw(self, session_id: str, assistant_id: str, user_text: str) -> None:
-        history = self.list_messages(session_id)
+        channel = f"chat:{session_id}"
+        history = self._history_for_llm(session_id)
+        # The history already ends with this turn's user message; the scope covers the turns before it.
+        prior = history[:-1] if history and history[-1] == {"role": "user", "content": user_text} else history
+        scope = history_scope("grumpyclaw", prior)
+        cacheable = self._reply_cache.cacheable(user_text)
+        cached = self._reply_cache.lookup(user_text, scope) if cacheable else None
+        if cached is not None:
+            self._set_assistant_final(session_id, assistant_id, cached)
+            self._event_bus.publish(
+                channel,
+                StreamEvent(
+                    event="chat.final",
+                    data={"session_id": session_id, "message_id": assistant_id, "content": cached},
+                ),
+            )
+            return
+
         messages: list[dict[str, Any]] = [{"role": "system", "content": self._system}]
-        for item in history:
-            if item["role"] in {"user", "assistant"} and item["content"]:
-                messages.append({"role": item["role"], "content": item["content"]})
+        messages.extend(history)
 
         try:
             hits = self._retriever.hybrid_search(user_text, top_k=5)
@@ -189,40 +226,93 @@ class ChatService:
         chunks = llm_chat(messages, stream=True)
         if not hasattr(chunks, "__iter__"):
             final = str(chunks)
-            self._set_assistant_final(assistant_id, final)
+            if cacheable and final:
+                self._reply_cache.store(user_text, final, scope)
+            self._set_assistant_final(session_id, assistant_id, final)
             self._event_bus.publish(
-                f"chat:{session_id}",
+                channel,
                 StreamEvent(event="chat.final", data={"session_id": session_id, "message_id": assistant_id, "content": final}),
             )
             return
 
         buffer: list[str] = []
-        for token in chunks:  # type: ignore[union-attr]
-            tok = str(token)
-            if not tok:
-                continue
-            buffer.append(tok)
+        pending: list[str] = []
+        last_flush = last_save = time.monotonic()
+        saved_count = 0
+
+        def flush_tokens() -> None:
+            nonlocal last_flush, last_save, saved_count
+            last_flush = time.monotonic()
+            if not pending:
+                return
+            if len(buffer) - saved_count >= _PARTIAL_SAVE_TOKENS or last_flush - last_save >= _PARTIAL_SAVE_SECONDS:
+                self._save_assistant_partial(assistant_id, "".join(buffer))
+                last_save, saved_count = last_flush, len(buffer)
+            chunk = "".join(pending)
+            pending.clear()
             self._event_bus.publish(
-                f"chat:{session_id}",
+                channel,
                 StreamEvent(
                     event="chat.token",
-                    data={"session_id": session_id, "message_id": assistant_id, "token": tok},
+                    data={"session_id": session_id, "message_id": assistant_id, "token": chunk},
                 ),
             )
+
+        for token in chunks:  # type: ignore[union-attr]
+            tok = str(token)
+            if not tok:
+                continue
+            buffer.append(tok)
+            pending.append(tok)
+            if len(pending) >= _TOKEN_FLUSH_COUNT or time.monotonic() - last_flush >= _TOKEN_FLUSH_SECONDS:
+                flush_tokens()
+        flush_tokens()
         final = "".join(buffer)
-        self._set_assistant_final(assistant_id, final)
+        if cacheable and final:
+            self._reply_cache.store(user_text, final, scope)
+        self._set_assistant_final(session_id, assistant_id, final)
         self._event_bus.publish(
-            f"chat:{session_id}",
+            channel,
             StreamEvent(event="chat.final", data={"session_id": session_id, "message_id": assistant_id, "content": final}),
         )
 
-    def _set_assistant_final(self, message_id: str, content: str, status: str = "final") -> None:
-        conn = get_conn()
-        try:
-            conn.execute(
-                "UPDATE app_chat_messages SET content = ?, status = ?, meta_json = ? WHERE id = ?",
-                (content, status, dump_json({"streaming": False}), message_id),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    def _save_assistant_partial(self, message_id: str, content: str) -> None:
+        # Status stays "processing", which keeps the partial text out of _history_for_llm.
+        with write_conn() as conn:
+            conn.execute(_SQL_SAVE_PARTIAL_MESSAGE, (content, message_id))
+
+    def _set_assistant_final(self, session_id: str, message_id: str, content: str, status: str = "final") -> None:
+        with write_conn() as conn:
+            conn.execute(_SQL_FINALIZE_MESSAGE, (content, status, _FINAL_META_JSON, message_id))
+        self._remember_message(session_id, message_id, "assistant", content)
+
+    def _history_for_llm(self, session_id: str) -> list[dict[str, str]]:
+        """Return user/assistant turns for the prompt, loading from SQLite only on a cache miss."""
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+            if cached is None:
+                # Load under the lock so a concurrent _remember_message cannot slip between read and insert.
+                ids: set[str] = set()
+                with read_conn() as conn:
+                    messages = list(_iter_history_for_llm(conn.execute(_SQL_HISTORY_FOR_LLM, (session_id,)), ids))
+                cached = (messages, ids)
+                self._cache_session(session_id, *cached)
+            else:
+                self._session_cache.move_to_end(session_id)
+            return list(cached[0])
+
+    def _remember_message(self, session_id: str, message_id: str, role: str, content: str) -> None:
+        if not content:
+            return
+        with self._session_cache_lock:
+            cached = self._session_cache.get(session_id)
+            if cached is None or message_id in cached[1]:
+                return
+            cached[0].append({"role": role, "content": content})
+            cached[1].add(message_id)
+
+    def _cache_session(self, session_id: str, messages: list[dict[str, str]], ids: set[str]) -> None:
+        self._session_cache[session_id] = (messages, ids)
+        self._session_cache.move_to_end(session_id)
+        while len(self._session_cache) > _SESSION_CACHE_SIZE:
+            self._session_cache.popitem(last=False)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -21,7 +22,9 @@ class ApiConfig:
     realtime_output_gain: float = 1.8
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> "ApiConfig":
+        """Read the environment once; later calls share the same frozen instance (see cache_clear)."""
         log = logging.getLogger("grumpyadmin.config")
 
         openai_text_model = os.environ.get("OPENAI_TEXT_MODEL", "").strip()
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
-import json
+import logging
+import os
+import queue
+import secrets
 import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain, groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 from grumpyclaw.memory.db import get_db_path, init_db
 
+from ._fastjson import dumps_str, loads
+
+LOG = logging.getLogger("grumpyadmin.db")
+
 
 def get_app_db_path() -> Path:
     return get_db_path()
@@ -15,6 +29,7 @@ def get_app_db_path() -> Path:
 def init_app_db() -> None:
     conn = init_db(get_app_db_path())
     try:
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS app_chat_sessions (
@@ -104,8 +119,15 @@ def init_app_db() -> None:
         _ensure_column(conn, "app_process_events", "level", "TEXT NOT NULL DEFAULT 'INFO'")
         _ensure_column(conn, "app_robot_actions", "source", "TEXT NOT NULL DEFAULT 'robot'")
         _ensure_column(conn, "app_robot_actions", "level", "TEXT NOT NULL DEFAULT 'INFO'")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_app_chat_messages_session ON app_chat_messages(session_id)")
+        # Superseded by the (session_id, created_at) index below, which also serves session_id lookups.
+        conn.execute("DROP INDEX IF EXISTS idx_app_chat_messages_session")
+        # Per-session history ordered by (created_at, rowid) reads straight off this index with no sort.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_app_chat_messages_session_created ON app_chat_messages(session_id, created_at)"
+        )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_chat_messages_created ON app_chat_messages(created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_app_chat_sessions_mode_updated ON app_chat_sessions(mode, updated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_app_chat_sessions_updated ON app_chat_sessions(updated_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_process_events_name ON app_process_events(process_name)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_process_events_source ON app_process_events(source)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_process_events_level ON app_process_events(level)")
@@ -113,6 +135,7 @@ def init_app_db() -> None:
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_process_events_created ON app_process_events(created_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_robot_actions_source ON app_robot_actions(source)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_robot_actions_level ON app_robot_actions(level)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_app_robot_actions_created ON app_robot_actions(created_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_realtime_events_type ON app_realtime_events(event_type)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_realtime_events_created ON app_realtime_events(created_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_app_heartbeat_runs_created ON app_heartbeat_runs(created_at)")
@@ -129,15 +152,264 @@ def _ensure_column(conn: sqlite3.Connection, table: str, column: str, column_def
     conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_def}")
 
 
-def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(get_app_db_path()), check_same_thread=False)
+# Pooled connections live for the process, so keep every distinct statement prepared.
+_STATEMENT_CACHE_SIZE = 256
+
+_CONN_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    # journal_mode=WAL is persistent and set once in init_app_db; these are per-connection.
+    for pragma in _CONN_PRAGMAS:
+        conn.execute(pragma)
+
+
+def _connect(database: str, *, uri: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        database,
+        uri=uri,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=_STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn)
     return conn
 
 
+def get_conn() -> sqlite3.Connection:
+    """Open a one-shot autocommit connection; writers wrap their statements in BEGIN IMMEDIATE."""
+    return _connect(str(get_app_db_path()))
+
+
+class ConnectionPool:
+    """Long-lived connections for one db file: a serialized writer plus read-only readers."""
+
+    def __init__(self, path: Path, max_readers: int | None = None):
+        self._path = path
+        self._max_readers = max(1, max_readers or os.cpu_count() or 4)
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.Lock()
+
+    @contextmanager
+    def read_conn(self) -> Iterator[sqlite3.Connection]:
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def write_conn(self) -> Iterator[sqlite3.Connection]:
+        """Yield the writer inside a BEGIN IMMEDIATE transaction; commit on success."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _connect(str(self._path))
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None:
+                # Leave a truncated WAL and fresh planner stats behind for the next start.
+                try:
+                    self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    self._writer.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    LOG.warning("checkpoint on close failed", exc_info=True)
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_lock:
+            self._reader_count = 0
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            can_open = self._reader_count < self._max_readers
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            return self._readers.get()
+        try:
+            return _connect(f"{self._path.resolve().as_uri()}?mode=ro", uri=True)
+        except Exception:
+            with self._reader_lock:
+                self._reader_count -= 1
+            raise
+
+
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    path = get_app_db_path()
+    key = str(path)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(path)
+            _POOLS[key] = pool
+        return pool
+
+
+@contextmanager
+def read_conn() -> Iterator[sqlite3.Connection]:
+    with get_pool().read_conn() as conn:
+        yield conn
+
+
+@contextmanager
+def write_conn() -> Iterator[sqlite3.Connection]:
+    with get_pool().write_conn() as conn:
+        yield conn
+
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+class BatchWriter:
+    """Background writer that commits queued statements in batched transactions.
+
+    Each submit() is kept together and in order; consecutive rows for the same SQL are
+    sent with one executemany. Once closed, submits are written synchronously instead.
+    """
+
+    def __init__(self, pool: ConnectionPool | None = None, *, max_batch: int = 128, name: str = "db-batch-writer"):
+        self._pool = pool or get_pool()
+        self._max_batch = max_batch
+        self._queue: queue.Queue[list[tuple[str, tuple[Any, ...]]] | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: tuple[Any, ...]) -> None:
+        self.submit_many([(sql, params)])
+
+    def submit_many(self, statements: Iterable[tuple[str, tuple[Any, ...]]]) -> None:
+        group = list(statements)
+        with self._lock:
+            if not self._closed:
+                self._queue.put(group)
+                return
+        self._write([group])
+
+    def flush(self) -> None:
+        """Block until everything submitted so far has been written."""
+        self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch: list[list[tuple[str, tuple[Any, ...]]]] = []
+            item = self._queue.get()
+            stop = item is None
+            if item is not None:
+                batch.append(item)
+            while not stop and len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[list[tuple[str, tuple[Any, ...]]]]) -> None:
+        try:
+            self._write_groups(batch)
+            return
+        except sqlite3.Error:
+            if len(batch) == 1:
+                LOG.exception("batched write failed")
+                return
+            LOG.warning("batched write of %d statement groups failed; retrying each on its own", len(batch))
+        # Groups come from unrelated callers; one bad row must not discard the others.
+        for group in batch:
+            try:
+                self._write_groups([group])
+            except sqlite3.Error:
+                LOG.exception("batched write failed")
+
+    def _write_groups(self, batch: list[list[tuple[str, tuple[Any, ...]]]]) -> None:
+        with self._pool.write_conn() as conn:
+            for sql, rows in groupby(chain.from_iterable(batch), key=itemgetter(0)):
+                conn.executemany(sql, [params for _, params in rows])
+
+
+_EMPTY_OBJECT_JSON = "{}"
+
+
+# (epoch milliseconds, ISO string) of the last now_iso() call, swapped as one reference.
+_last_iso: tuple[int, str] = (-1, "")
+
+
+def now_iso() -> str:
+    """UTC timestamp at millisecond precision; calls within the same millisecond reuse one string."""
+    global _last_iso
+    ms = time.time_ns() // 1_000_000
+    last_ms, text = _last_iso
+    if ms != last_ms:
+        moment = datetime.fromtimestamp(ms // 1000, timezone.utc).replace(microsecond=ms % 1000 * 1000)
+        text = moment.isoformat(timespec="milliseconds")
+        _last_iso = (ms, text)
+    return text
+
+
+def new_id() -> str:
+    """Random 128-bit row id as 32 hex chars; cheaper than formatting a uuid4."""
+    return secrets.token_hex(16)
+
+
 def dump_json(data: Any) -> str:
-    return json.dumps(data, ensure_ascii=True)
+    if not data and isinstance(data, dict):
+        return _EMPTY_OBJECT_JSON
+    return dumps_str(data)
 
 
-def load_json(raw: str) -> Any:
-    return json.loads(raw)
+def load_json(raw: str | bytes) -> Any:
+    return loads(raw)
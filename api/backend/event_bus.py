@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-import json
-import queue
 import threading
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass
 from typing import Any, Generator
 
+from ._fastjson import dumps_bytes
+
+# Sent when a subscriber has been idle for _KEEPALIVE_SECONDS so proxies keep the stream open.
+_KEEPALIVE = b": keepalive\n\n"
+_KEEPALIVE_SECONDS = 15.0
+# Frames buffered per subscriber; a slow reader loses the oldest ones first.
+_SUBSCRIBER_BUFFER = 500
+
 
 @dataclass(frozen=True)
 class StreamEvent:
@@ -14,45 +20,90 @@ class StreamEvent:
     data: dict[str, Any]
 
 
+class Subscription:
+    """One subscriber's bounded frame buffer plus a wake-up flag.
+
+    deque.append/popleft are atomic, so publishers never take a lock to deliver;
+    ``ready`` is only set when it is not already set.
+    """
+
+    __slots__ = ("frames", "ready")
+
+    def __init__(self, maxlen: int = _SUBSCRIBER_BUFFER) -> None:
+        self.frames: deque[bytes] = deque(maxlen=maxlen)
+        self.ready = threading.Event()
+
+    def push(self, frame: bytes) -> None:
+        self.frames.append(frame)
+        if not self.ready.is_set():
+            self.ready.set()
+
+    def drain(self) -> list[bytes]:
+        out: list[bytes] = []
+        frames = self.frames
+        try:
+            while True:
+                out.append(frames.popleft())
+        except IndexError:
+            return out
+
+
 class EventBus:
-    """Thread-safe pub/sub used by SSE endpoints."""
+    """Thread-safe pub/sub used by SSE endpoints.
+
+    Subscriber tuples are copy-on-write: subscribe/unsubscribe replace a channel's
+    tuple under the lock, and publish reads the current tuple without locking.
+    Subscribers receive ready-to-send SSE frames as bytes, encoded once per publish.
+    """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._subs: dict[str, list[queue.Queue[StreamEvent]]] = defaultdict(list)
+        self._subs: dict[str, tuple[Subscription, ...]] = {}
 
-    def subscribe(self, channel: str) -> queue.Queue[StreamEvent]:
-        q: queue.Queue[StreamEvent] = queue.Queue(maxsize=500)
+    def subscribe(self, channel: str) -> Subscription:
+        sub = Subscription()
         with self._lock:
-            self._subs[channel].append(q)
-        return q
+            self._subs[channel] = self._subs.get(channel, ()) + (sub,)
+        return sub
 
-    def unsubscribe(self, channel: str, q: queue.Queue[StreamEvent]) -> None:
+    def unsubscribe(self, channel: str, sub: Subscription) -> None:
         with self._lock:
             items = self._subs.get(channel)
             if not items:
                 return
-            self._subs[channel] = [item for item in items if item is not q]
+            remaining = tuple(item for item in items if item is not sub)
+            if remaining:
+                self._subs[channel] = remaining
+            else:
+                del self._subs[channel]
 
     def publish(self, channel: str, event: StreamEvent) -> None:
-        with self._lock:
-            targets = list(self._subs.get(channel, []))
-        for q in targets:
-            try:
-                q.put_nowait(event)
-            except queue.Full:
-                pass
+        targets = self._subs.get(channel)
+        if not targets:
+            return
+        frame = encode_sse_frame(event)
+        for sub in targets:
+            sub.push(frame)
+
+
+def encode_sse_frame(event: StreamEvent) -> bytes:
+    return b"".join((b"event: ", event.event.encode("utf-8"), b"\ndata: ", dumps_bytes(event.data), b"\n\n"))
 
 
-def sse_stream(channel: str, bus: EventBus) -> Generator[str, None, None]:
-    q = bus.subscribe(channel)
+def sse_stream(channel: str, bus: EventBus) -> Generator[bytes, None, None]:
+    sub = bus.subscribe(channel)
     try:
         while True:
-            try:
-                evt = q.get(timeout=15.0)
-                payload = json.dumps(evt.data, ensure_ascii=True)
-                yield f"event: {evt.event}\ndata: {payload}\n\n"
-            except queue.Empty:
-                yield ": keepalive\n\n"
+            frames = sub.drain()
+            if frames:
+                # Everything that queued up since the last send goes out as one chunk.
+                yield frames[0] if len(frames) == 1 else b"".join(frames)
+                continue
+            # Clear before the final emptiness check so a push in between still wakes us.
+            sub.ready.clear()
+            if sub.frames:
+                continue
+            if not sub.ready.wait(timeout=_KEEPALIVE_SECONDS):
+                yield _KEEPALIVE
     finally:
-        bus.unsubscribe(channel, q)
+        bus.unsubscribe(channel, sub)
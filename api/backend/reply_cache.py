@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+_REPLY_CACHE_SIZE = 256
+# Replies draw on memory search results, so they are only reused while the index is likely unchanged.
+_REPLY_CACHE_TTL_SECONDS = 600.0
+_SIMILARITY_THRESHOLD = 0.95
+# Longer prompts are rarely repeated verbatim and are more likely to depend on the conversation.
+_MAX_CACHEABLE_CHARS = 200
+# Prompts that act on the world or ask for fresh state must always reach the model.
+_UNCACHEABLE = re.compile(
+    r"\b(robot|skill|run|remember|move|look|nod|antenna|now|today|latest|current|time)\b",
+    re.IGNORECASE,
+)
+_RECENT_VECTORS = 32
+
+
+class ReplyCache:
+    """Exact and near-duplicate prompt -> final reply cache for idempotent chat turns.
+
+    Entries are partitioned by ``scope``, which callers derive from the mode and the
+    conversation so far; a reply is only reused for a prompt asked in the same context.
+    Exact hits are keyed on (scope, normalized prompt text). Otherwise the prompt is
+    embedded and compared against stored prompt vectors of the same scope; a cosine
+    similarity at or above the threshold reuses the stored reply. Both levels evict
+    oldest-first, and entries older than ``ttl`` seconds are never returned.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        maxsize: int = _REPLY_CACHE_SIZE,
+        threshold: float = _SIMILARITY_THRESHOLD,
+        ttl: float = _REPLY_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._embed = embed
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # Scores are float32, so compare against the threshold at the same precision.
+        self._threshold = np.float32(threshold)
+        self._lock = threading.Lock()
+        # (scope, prompt) -> (stored at, reply)
+        self._exact: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        # Ring buffer of unit-length prompt vectors with the scope, store time and reply of each slot.
+        self._vectors: np.ndarray | None = None
+        self._scopes: list[str] = []
+        self._stored_at: list[float] = []
+        self._replies: list[str] = []
+        self._next_slot = 0
+        # Vectors computed by lookup(), kept so store() does not embed the same prompt again.
+        self._recent_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    @staticmethod
+    def cacheable(text: str) -> bool:
+        return len(text) <= _MAX_CACHEABLE_CHARS and not _UNCACHEABLE.search(text)
+
+    def lookup(self, text: str, scope: str = "") -> str | None:
+        prompt = _normalize_prompt(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._exact.get((scope, prompt))
+            if entry is not None and now - entry[0] < self._ttl:
+                self._exact.move_to_end((scope, prompt))
+                return entry[1]
+            if scope not in self._scopes:
+                return None
+        vector = self._vector(prompt)
+        if vector is None:
+            return None
+        with self._lock:
+            if self._vectors is None:
+                return None
+            slots = [
+                slot
+                for slot, slot_scope in enumerate(self._scopes)
+                if slot_scope == scope and now - self._stored_at[slot] < self._ttl
+            ]
+            if not slots:
+                return None
+            scores = self._vectors[slots] @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self._threshold:
+                return self._replies[slots[best]]
+        return None
+
+    def store(self, text: str, reply: str, scope: str = "") -> None:
+        prompt = _normalize_prompt(text)
+        now = time.monotonic()
+        with self._lock:
+            self._exact[(scope, prompt)] = (now, reply)
+            self._exact.move_to_end((scope, prompt))
+            while len(self._exact) > self._maxsize:
+                self._exact.popitem(last=False)
+            vector = self._recent_vectors.pop(prompt, None)
+        if vector is None:
+            vector = self._vector(prompt)
+            if vector is None:
+                return
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self._maxsize, vector.shape[0]), dtype=np.float32)
+            slot = self._next_slot
+            self._vectors[slot] = vector
+            if slot < len(self._replies):
+                self._scopes[slot] = scope
+                self._stored_at[slot] = now
+                self._replies[slot] = reply
+            else:
+                self._scopes.append(scope)
+                self._stored_at.append(now)
+                self._replies.append(reply)
+            self._next_slot = (slot + 1) % self._maxsize
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._vectors = None
+            self._scopes = []
+            self._stored_at = []
+            self._replies = []
+            self._next_slot = 0
+            self._recent_vectors.clear()
+
+    def _vector(self, key: str) -> np.ndarray | None:
+        try:
+            vector = np.asarray(self._embed(key), dtype=np.float32)
+        except Exception:
+            return None
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        vector /= norm
+        with self._lock:
+            self._recent_vectors[key] = vector
+            while len(self._recent_vectors) > _RECENT_VECTORS:
+                self._recent_vectors.popitem(last=False)
+        return vector
+
+
+def _normalize_prompt(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def history_scope(mode: str, history: Sequence[dict[str, str]]) -> str:
+    """Cache scope for a prompt asked after ``history`` (earlier turns only) in ``mode``."""
+    if not history:
+        return mode
+    digest = hashlib.blake2b(digest_size=16)
+    for message in history:
+        digest.update(message["role"].encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(message["content"].encode("utf-8"))
+        digest.update(b"\0")
+    return f"{mode}:{digest.hexdigest()}"
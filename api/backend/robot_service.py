@@ -2,18 +2,31 @@ from __future__ import annotations
 
 import threading
 import time
-import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 from grumpyreachy.actions import ControlAction
 from grumpyreachy.app import GrumpyReachyApp, RunState
 
 from .config import ApiConfig
-from .db import dump_json, get_conn
+from .db import BatchWriter, dump_json, new_id, now_iso
 from .event_bus import EventBus, StreamEvent
 
+# Fallback status check; state changes are published as they happen.
+_STATUS_POLL_SECONDS = 30.0
+# Actions admitted back to back before robot_rate_limit_seconds spacing applies.
+_ACTION_BURST = 1
+# Above this many tracked action names, buckets that have fully refilled are dropped.
+_MAX_RATE_BUCKETS = 64
+
+_SQL_INSERT_ROBOT_ACTION = """
+    INSERT INTO app_robot_actions(id, source, level, action, payload_json, accepted, reason, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Tool phases that end a call, mapped to the robot feedback they trigger.
+_FEEDBACK_STATES = {"tool_succeeded": "success", "tool_failed": "error"}
+
 
 class ApiFeedbackBridge:
     """Adapter that forwards FeedbackManager events to API SSE channels."""
@@ -22,22 +35,17 @@ class ApiFeedbackBridge:
         self._event_bus = event_bus
 
     def emit(self, event_type: str, tool_name: str, message: str = "") -> dict[str, Any]:
+        """Publish one tool.event; terminal phases also carry the robot feedback state."""
         data = {
             "tool_name": tool_name,
             "phase": event_type,
             "message": message,
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": now_iso(),
         }
+        feedback_state = _FEEDBACK_STATES.get(event_type)
+        if feedback_state is not None:
+            data["feedback_state"] = feedback_state
         self._event_bus.publish("robot-feedback", StreamEvent(event="tool.event", data=data))
-        if event_type in {"tool_succeeded", "tool_failed"}:
-            state = "success" if event_type == "tool_succeeded" else "error"
-            self._event_bus.publish(
-                "robot-feedback",
-                StreamEvent(
-                    event="robot.feedback",
-                    data={"state": state, "message": message, "ts": data["ts"]},
-                ),
-            )
         return data
 
 
@@ -48,39 +56,106 @@ class RobotActionResult:
     reason: str = ""
 
 
-def _status_payload(
-    run_state: str,
-    robot_connected: bool,
-    thread_alive: bool,
-) -> dict[str, Any]:
+_STOPPED_STATUS = ("stopped", False, False)
+
+
+def _status_payload(state: tuple[str, bool, bool]) -> dict[str, Any]:
+    run_state, robot_connected, thread_alive = state
     return {
         "run_state": run_state,
         "robot_connected": robot_connected,
         "thread_alive": thread_alive,
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": now_iso(),
     }
 
 
+# Payloads come from the validated request model or from raw tool-call arguments; both pass
+# None for fields that were not given, and typed values skip the conversion.
+def _as_float(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    return value if type(value) is float else float(value)
+
+
+def _as_str(value: Any, default: str) -> str:
+    if value is None:
+        return default
+    return value if type(value) is str else str(value)
+
+
+# nod carries no parameters; the control worker only reads actions, so one instance is shared.
+_NOD_ACTION = ControlAction(name="nod")
+
+
+def _build_nod(payload: dict[str, Any]) -> ControlAction:
+    return _NOD_ACTION
+
+
+def _build_look_at(payload: dict[str, Any]) -> ControlAction:
+    get = payload.get
+    return ControlAction(
+        name="look_at",
+        payload={
+            "x": _as_float(get("x"), 0.35),
+            "y": _as_float(get("y"), 0.0),
+            "z": _as_float(get("z"), 0.1),
+            "duration": _as_float(get("duration"), 1.0),
+        },
+    )
+
+
+def _build_antenna_feedback(payload: dict[str, Any]) -> ControlAction:
+    return ControlAction(name="antenna_feedback", payload={"state": _as_str(payload.get("state"), "attention")})
+
+
+def _build_speak(payload: dict[str, Any]) -> ControlAction:
+    return ControlAction(name="speak", payload={"text": _as_str(payload.get("text"), "")})
+
+
+# Action name -> ControlAction builder; names missing here are rejected as unsupported.
+_CONTROL_ACTION_BUILDERS: dict[str, Callable[[dict[str, Any]], ControlAction]] = {
+    "nod": _build_nod,
+    "look_at": _build_look_at,
+    "antenna_feedback": _build_antenna_feedback,
+    "speak": _build_speak,
+}
+
+
 class RobotService:
     def __init__(self, event_bus: EventBus, config: ApiConfig):
         self._event_bus = event_bus
         self._config = config
         self._app: GrumpyReachyApp | None = None
         self._thread: threading.Thread | None = None
+        # True while the current app thread runs; read without the lock by enqueue_action.
+        self._running = False
+        # Guards the app/thread lifecycle only; the per-action rate limit has its own lock.
         self._lock = threading.Lock()
-        self._last_action_at: dict[str, float] = {}
+        self._rate_lock = threading.Lock()
+        # action -> theoretical arrival time in monotonic ns (GCRA form of a token bucket);
+        # a bucket at or before "now" is full, which is the same as having no entry.
+        self._buckets: dict[str, int] = {}
+        self._rate_interval_ns = int(config.robot_rate_limit_seconds * 1_000_000_000)
+        self._rate_burst_ns = (_ACTION_BURST - 1) * self._rate_interval_ns
         self.feedback_bridge = ApiFeedbackBridge(event_bus=event_bus)
-        self._last_emitted_status: dict[str, Any] | None = None
+        # (run_state, robot_connected, thread_alive) last published on "runtime".
+        self._last_emitted_status: tuple[str, bool, bool] | None = None
+        self._status_publish_lock = threading.Lock()
         self._status_poller_thread: threading.Thread | None = None
         self._status_poller_stop = threading.Event()
+        # Action log rows are committed in batches off the request thread.
+        self.action_writer = BatchWriter(name="robot-action-writer")
 
     def start(self) -> None:
         with self._lock:
             if self._thread and self._thread.is_alive():
                 return
-            self._app = GrumpyReachyApp()
-            self._thread = threading.Thread(target=self._app.run_forever, name="api-grumpyreachy", daemon=True)
+            app = GrumpyReachyApp()
+            app.on_status_change = self._publish_status
+            self._app = app
+            self._thread = threading.Thread(target=self._run_app, args=(app,), name="api-grumpyreachy", daemon=True)
             self._thread.start()
+            self._running = True
             if self._status_poller_thread is None or not self._status_poller_thread.is_alive():
                 self._status_poller_stop.clear()
                 self._status_poller_thread = threading.Thread(
@@ -89,35 +164,58 @@ class RobotService:
                     daemon=True,
                 )
                 self._status_poller_thread.start()
+        self._publish_status()
 
-    def _status_poller_loop(self) -> None:
-        while not self._status_poller_stop.wait(timeout=2.0):
-            payload = self.status()
+    def _run_app(self, app: GrumpyReachyApp) -> None:
+        try:
+            app.run_forever()
+        finally:
+            # is_alive() is still True here; report the exit explicitly unless a restart replaced the app.
             with self._lock:
-                last = self._last_emitted_status
-            if last is None or (
-                last.get("run_state") != payload["run_state"]
-                or last.get("robot_connected") != payload["robot_connected"]
-                or last.get("thread_alive") != payload["thread_alive"]
-            ):
-                with self._lock:
-                    self._last_emitted_status = dict(payload)
-                self._event_bus.publish(
-                    "runtime",
-                    StreamEvent(event="robot.status", data=payload),
-                )
+                current = self._app is app
+                if current:
+                    self._running = False
+            if current:
+                self._publish_status(thread_alive=False)
 
-    def status(self) -> dict[str, Any]:
-        """Return current robot service state for API/UI (run_state, robot_connected, thread_alive, ts)."""
+    def _status_poller_loop(self) -> None:
+        # Changes are pushed by _publish_status; this only catches anything without a hook.
+        while not self._status_poller_stop.wait(timeout=_STATUS_POLL_SECONDS):
+            self._publish_status()
+
+    def _publish_status(self, thread_alive: bool | None = None) -> None:
+        """Publish robot.status on "runtime" if the status changed since the last publish."""
+        state = self._status_state()
+        if thread_alive is not None:
+            state = (state[0], state[1], thread_alive)
+        with self._status_publish_lock:
+            if state == self._last_emitted_status:
+                return
+            self._last_emitted_status = state
+            self._event_bus.publish("runtime", StreamEvent(event="robot.status", data=_status_payload(state)))
+
+    def _status_state(self) -> tuple[str, bool, bool]:
+        """(run_state, robot_connected, thread_alive) without building the timestamped payload."""
         with self._lock:
             app = self._app
             thread = self._thread
         if app is None:
-            return _status_payload("stopped", False, False)
+            return _STOPPED_STATUS
         thread_alive = thread is not None and thread.is_alive()
-        run_state = app.state.name
-        robot_connected = getattr(app._controller, "connected", False)
-        return _status_payload(run_state, robot_connected, thread_alive)
+        return (app.state.name, getattr(app._controller, "connected", False), thread_alive)
+
+    def status(self) -> dict[str, Any]:
+        """Return current robot service state for API/UI (run_state, robot_connected, thread_alive, ts)."""
+        return _status_payload(self._status_state())
+
+    @property
+    def mini(self) -> Any | None:
+        """The connected ReachyMini of the running app, or None."""
+        app = self._app
+        if app is None:
+            return None
+        controller = getattr(app, "_controller", None)
+        return getattr(controller, "_mini", None) if controller is not None else None
 
     def get_app(self) -> GrumpyReachyApp | None:
         """Return the running GrumpyReachyApp instance, or None if not started."""
@@ -127,82 +225,74 @@ class RobotService:
     def stop(self) -> None:
         self._status_poller_stop.set()
         with self._lock:
-            if self._app:
-                self._app.stop()
-            if self._thread and self._thread.is_alive():
-                self._thread.join(timeout=3.0)
+            self._running = False
+            app = self._app
+            thread = self._thread
+        # Join outside the lock: the app thread publishes its final status through status().
+        if app:
+            app.stop()
+        if thread and thread.is_alive():
+            thread.join(timeout=3.0)
+        with self._status_publish_lock:
             self._last_emitted_status = None
 
+    def shutdown(self) -> None:
+        """Stop the robot and write out any queued action log rows."""
+        self.stop()
+        self.action_writer.close()
+
     def enqueue_action(self, payload: dict[str, Any]) -> RobotActionResult:
-        self.start()
+        if not self._running:
+            self.start()
         action = str(payload.get("action", "")).strip()
-        action_id = str(uuid.uuid4())
-        now = time.monotonic()
-        with self._lock:
-            last = self._last_action_at.get(action, 0.0)
-            if now - last < self._config.robot_rate_limit_seconds:
-                reason = "Action rate limited"
-                self._record_action(action_id, action, payload, False, reason)
-                return RobotActionResult(accepted=False, action_id=action_id, reason=reason)
-            self._last_action_at[action] = now
+        action_id = new_id()
+        if not self._try_consume(action):
+            reason = "Action rate limited"
+            self._record_action(action_id, action, payload, False, reason)
+            return RobotActionResult(accepted=False, action_id=action_id, reason=reason)
         if action == "look_at" and not bool(payload.get("confirm")):
             reason = "look_at requires confirm=true"
             self._record_action(action_id, action, payload, False, reason)
             return RobotActionResult(accepted=False, action_id=action_id, reason=reason)
         if action == "speak":
-            text = str(payload.get("text", ""))
+            text = _as_str(payload.get("text"), "")
             if len(text) >= self._config.robot_speak_confirm_threshold and not bool(payload.get("confirm")):
                 reason = "long speak requires confirm=true"
                 self._record_action(action_id, action, payload, False, reason)
                 return RobotActionResult(accepted=False, action_id=action_id, reason=reason)
 
-        ca = self._to_control_action(payload)
-        if not ca:
+        builder = _CONTROL_ACTION_BUILDERS.get(action)
+        if builder is None:
             reason = f"Unsupported action: {action}"
             self._record_action(action_id, action, payload, False, reason)
             return RobotActionResult(accepted=False, action_id=action_id, reason=reason)
+        ca = builder(payload)
 
         ok = bool(self._app and self._app.enqueue(ca))
         reason = "" if ok else "robot runtime unavailable"
         self._record_action(action_id, action, payload, ok, reason)
         return RobotActionResult(accepted=ok, action_id=action_id, reason=reason)
 
-    @staticmethod
-    def _to_control_action(payload: dict[str, Any]) -> ControlAction | None:
-        action = str(payload.get("action", ""))
-        if action == "nod":
-            return ControlAction(name="nod")
-        if action == "look_at":
-            return ControlAction(
-                name="look_at",
-                payload={
-                    "x": float(payload.get("x", 0.35)),
-                    "y": float(payload.get("y", 0.0)),
-                    "z": float(payload.get("z", 0.1)),
-                    "duration": float(payload.get("duration", 1.0)),
-                },
-            )
-        if action == "antenna_feedback":
-            return ControlAction(name="antenna_feedback", payload={"state": str(payload.get("state", "attention"))})
-        if action == "speak":
-            return ControlAction(name="speak", payload={"text": str(payload.get("text", ""))})
-        return None
+    def _try_consume(self, action: str) -> bool:
+        """Take one token from ``action``'s bucket; False if it is empty."""
+        now = time.monotonic_ns()
+        # Nothing else ever waits on _rate_lock.
+        with self._rate_lock:
+            tat = max(self._buckets.get(action, now), now)
+            if tat - now > self._rate_burst_ns:
+                return False
+            self._buckets[action] = tat + self._rate_interval_ns
+            if len(self._buckets) > _MAX_RATE_BUCKETS:
+                self._buckets = {name: t for name, t in self._buckets.items() if t > now}
+            return True
 
     def _record_action(self, action_id: str, action: str, payload: dict[str, Any], accepted: bool, reason: str) -> None:
-        ts = datetime.now(timezone.utc).isoformat()
+        ts = now_iso()
         level = "INFO" if accepted else "WARNING"
-        conn = get_conn()
-        try:
-            conn.execute(
-                """
-                INSERT INTO app_robot_actions(id, source, level, action, payload_json, accepted, reason, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (action_id, "robot", level, action, dump_json(payload), 1 if accepted else 0, reason, ts),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        self.action_writer.submit(
+            _SQL_INSERT_ROBOT_ACTION,
+            (action_id, "robot", level, action, dump_json(payload), 1 if accepted else 0, reason, ts),
+        )
         self._event_bus.publish(
             "runtime",
             StreamEvent(
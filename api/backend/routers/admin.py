@@ -44,19 +44,28 @@ def logs(
     event_type: str | None = Query(default=None),
     q: str | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    include_payload: bool = Query(default=False),
 ) -> dict[str, object]:
-    return {
-        "source": source,
-        "level": level,
-        "process_name": process_name,
-        "event_type": event_type,
-        "q": q,
-        "items": request.app.state.container.admin.logs(
+    try:
+        page = request.app.state.container.admin.logs(
             source=source,
             level=level,
             process_name=process_name,
             event_type=event_type,
             q=q,
             limit=limit,
-        ),
+            cursor=cursor,
+            include_payload=include_payload,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        "source": source,
+        "level": level,
+        "process_name": process_name,
+        "event_type": event_type,
+        "q": q,
+        "items": page["items"],
+        "next_cursor": page["next_cursor"],
     }
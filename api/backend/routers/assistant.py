@@ -74,8 +74,14 @@ def realtime_status(request: Request) -> dict[str, object]:
 def realtime_history(
     request: Request,
     limit: int = Query(default=200, ge=1, le=1000),
-) -> list[dict[str, object]]:
-    return request.app.state.container.assistant.realtime_history(limit=limit)
+    before_id: int | None = Query(default=None, ge=1),
+    after_id: int | None = Query(default=None, ge=0),
+) -> dict[str, object]:
+    return request.app.state.container.assistant.realtime_history(
+        limit=limit,
+        before_id=before_id,
+        after_id=after_id,
+    )
 
 
 @router.get("/realtime/stream")
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import os
+from collections import deque
 from pathlib import Path
 from typing import Any
 
@@ -13,10 +14,63 @@ from fastapi.responses import JSONResponse, StreamingResponse
 
 from grumpyreachy.config import GrumpyReachyConfig
 
+from .._fastjson import dumps_bytes
+
 router = APIRouter(prefix="/conversation", tags=["conversation"])
 profiles_router = APIRouter(prefix="/profiles", tags=["profiles"])
 LOG = logging.getLogger("grumpyadmin.conversation")
 
+# Transcript SSE frames that never change.
+_TRANSCRIPT_UNAVAILABLE_FRAME = b"data: " + dumps_bytes({"error": "Transcript not available"}) + b"\n\n"
+_TRANSCRIPT_KEEPALIVE = b": keepalive\n\n"
+# Most transcript messages sent in one chunk per wakeup.
+_TRANSCRIPT_DRAIN_MAX = 64
+# Transcript messages held for the SSE reader; past this the oldest are dropped.
+_TRANSCRIPT_BUFFER = 1024
+
+
+class TranscriptFeed:
+    """Bounded drop-oldest buffer between the realtime handler and the transcript SSE stream.
+
+    append() may be called from any thread; the reader wakes through its event loop.
+    """
+
+    def __init__(self, maxlen: int = _TRANSCRIPT_BUFFER) -> None:
+        self._items: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self._ready = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def append(self, msg: dict[str, Any]) -> None:
+        self._items.append(msg)
+        loop = self._loop
+        if loop is not None and not self._ready.is_set():
+            loop.call_soon_threadsafe(self._ready.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until messages are buffered; False on timeout."""
+        self._loop = asyncio.get_running_loop()
+        if self._items:
+            return True
+        # Clear before the final check so an append in between still wakes us.
+        self._ready.clear()
+        if self._items:
+            return True
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def drain(self, limit: int) -> list[dict[str, Any]]:
+        out: list[dict[str, Any]] = []
+        items = self._items
+        try:
+            while len(out) < limit:
+                out.append(items.popleft())
+        except IndexError:
+            pass
+        return out
+
 
 def _webrtc_offer_unavailable(request: Request) -> JSONResponse:
     """Returned when fastrtc stream is not mounted (fallback route)."""
@@ -26,9 +80,11 @@ def _webrtc_offer_unavailable(request: Request) -> JSONResponse:
         detail += f" Reason: {reason}"
     return JSONResponse(status_code=503, content={"detail": detail})
 
+_DEFAULT_PROFILES_DIR = Path(__file__).resolve().parents[3] / "src" / "grumpyreachy" / "profiles"
+
 # Module-level stream and transcript queue for SSE; set by mount_conversation_stream
 _conversation_stream: Any = None
-_transcript_queue: asyncio.Queue[dict[str, Any]] | None = None
+_transcript_queue: TranscriptFeed | None = None
 
 
 def _profiles_dir(request: Request) -> Path:
@@ -38,10 +94,68 @@ def _profiles_dir(request: Request) -> Path:
     app_instance = robot.get_app() if robot else None
     if app_instance and hasattr(app_instance, "_profiles_dir"):
         return app_instance._profiles_dir
-    return Path(__file__).resolve().parents[3] / "src" / "grumpyreachy" / "profiles"
+    return _DEFAULT_PROFILES_DIR
+
+
+# (path, mtime_ns, contents) of the last default/tools.txt read; reread only when the file changes.
+_default_tools_cache: tuple[Path, int, bytes] | None = None
+
+
+def _default_tools(base: Path) -> bytes:
+    """Contents of ``base/default/tools.txt``, or b"" if it does not exist."""
+    global _default_tools_cache
+    path = base / "default" / "tools.txt"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return b""
+    cached = _default_tools_cache
+    if cached is None or cached[0] != path or cached[1] != mtime_ns:
+        try:
+            cached = (path, mtime_ns, path.read_bytes())
+        except OSError:
+            return b""
+        _default_tools_cache = cached
+    return cached[2]
+
+
+# profiles dir -> (dir mtime_ns, entries). A directory's mtime only tracks its own entries, so
+# the profile endpoints that write instructions.txt into a subdirectory clear this as well.
+_profile_index: dict[Path, tuple[int, tuple[dict[str, Any], ...]]] = {}
+
+
+def _scan_profiles(d: Path) -> tuple[dict[str, Any], ...]:
+    """Subdirectories of ``d`` that contain instructions.txt, sorted by name; rescanned on change."""
+    try:
+        mtime_ns = d.stat().st_mtime_ns
+    except OSError:
+        return ()
+    cached = _profile_index.get(d)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        with os.scandir(d) as it:
+            entries = sorted((entry for entry in it if entry.is_dir()), key=lambda entry: entry.name)
+    except OSError:
+        return ()
+    profiles = tuple(
+        {"name": entry.name, "path": entry.path}
+        for entry in entries
+        if os.path.isfile(os.path.join(entry.path, "instructions.txt"))
+    )
+    _profile_index[d] = (mtime_ns, profiles)
+    return profiles
 
 
 def _external_profiles_dir(request: Request) -> Path | None:
+    try:
+        # Bound once by mount_conversation_stream.
+        return request.app.state.external_profiles_dir
+    except AttributeError:
+        return _configured_external_profiles_dir()
+
+
+def _configured_external_profiles_dir() -> Path | None:
     config = GrumpyReachyConfig.from_env()
     if config.external_profiles_dir:
         return Path(config.external_profiles_dir)
@@ -93,14 +207,17 @@ async def conversation_transcript_stream(request: Request) -> StreamingResponse:
     async def event_stream():
         q = _transcript_queue
         if not q:
-            yield f"data: {json.dumps({'error': 'Transcript not available'})}\n\n"
+            yield _TRANSCRIPT_UNAVAILABLE_FRAME
             return
         while True:
-            try:
-                msg = await asyncio.wait_for(q.get(), timeout=30.0)
-                yield f"data: {json.dumps(msg, ensure_ascii=False)}\n\n"
-            except asyncio.TimeoutError:
-                yield ": keepalive\n\n"
+            if not await q.wait(timeout=30.0):
+                yield _TRANSCRIPT_KEEPALIVE
+                continue
+            # Everything already buffered goes out in the same chunk.
+            parts: list[bytes] = []
+            for msg in q.drain(_TRANSCRIPT_DRAIN_MAX):
+                parts += (b"data: ", dumps_bytes(msg), b"\n\n")
+            yield b"".join(parts)
 
     return StreamingResponse(
         event_stream(),
@@ -116,11 +233,8 @@ async def list_profiles(request: Request) -> list[dict[str, Any]]:
     external = _external_profiles_dir(request)
     result: list[dict[str, Any]] = []
     for d in (base, external) if external else (base,):
-        if not d or not d.is_dir():
-            continue
-        for p in sorted(d.iterdir()):
-            if p.is_dir() and (p / "instructions.txt").is_file():
-                result.append({"name": p.name, "path": str(p)})
+        if d:
+            result.extend(_scan_profiles(d))
     return result
 
 
@@ -135,13 +249,14 @@ async def create_profile(request: Request, body: dict[str, Any]) -> dict[str, An
     profile_dir = base / name
     profile_dir.mkdir(parents=True, exist_ok=True)
     (profile_dir / "instructions.txt").write_text(instructions, encoding="utf-8")
+    _profile_index.clear()
     tools_txt = body.get("tools")
     if tools_txt is not None:
         (profile_dir / "tools.txt").write_text(tools_txt if isinstance(tools_txt, str) else "\n".join(tools_txt), encoding="utf-8")
     else:
-        default_tools = (base / "default" / "tools.txt").read_text(encoding="utf-8") if (base / "default" / "tools.txt").is_file() else ""
+        default_tools = _default_tools(base)
         if default_tools:
-            (profile_dir / "tools.txt").write_text(default_tools, encoding="utf-8")
+            (profile_dir / "tools.txt").write_bytes(default_tools)
     return {"ok": True, "name": name, "path": str(profile_dir)}
 
 
@@ -154,6 +269,7 @@ async def update_profile(request: Request, name: str, body: dict[str, Any]) -> d
         return {"ok": False, "error": "Profile not found"}
     if "instructions" in body:
         (profile_dir / "instructions.txt").write_text(str(body["instructions"]), encoding="utf-8")
+        _profile_index.clear()
     if "tools" in body:
         (profile_dir / "tools.txt").write_text(body["tools"] if isinstance(body["tools"], str) else "\n".join(body["tools"]), encoding="utf-8")
     return {"ok": True, "name": name}
@@ -162,14 +278,14 @@ async def update_profile(request: Request, name: str, body: dict[str, Any]) -> d
 def build_factory_handler(
     get_app_fn: Any,
     default_profile: str,
-    transcript_queue: asyncio.Queue[dict[str, Any]],
+    transcript_queue: TranscriptFeed,
 ) -> Any:
     """Build an AsyncStreamHandler whose copy() returns a real handler from the app."""
 
     from fastrtc import AsyncStreamHandler
 
     class FactoryHandler(AsyncStreamHandler):
-        def __init__(self, get_app: Any, profile: str, tq: asyncio.Queue):
+        def __init__(self, get_app: Any, profile: str, tq: TranscriptFeed):
             super().__init__(expected_layout="mono", output_sample_rate=24000, input_sample_rate=24000)
             self._get_app = get_app
             self._profile = profile
@@ -188,13 +304,7 @@ def build_factory_handler(
             if not app:
                 raise RuntimeError("Robot app not running; start the robot first.")
 
-            def on_transcript(m: dict) -> None:
-                try:
-                    self._transcript_queue.put_nowait(m)
-                except Exception:
-                    pass
-
-            return app.create_realtime_handler(profile_name=self._profile, on_transcript=on_transcript)
+            return app.create_realtime_handler(profile_name=self._profile, on_transcript=self._transcript_queue.append)
 
     return FactoryHandler(get_app_fn, default_profile, transcript_queue)
 
@@ -202,7 +312,8 @@ def build_factory_handler(
 def mount_conversation_stream(app: Any, get_app_fn: Any, default_profile: str = "default") -> None:
     """Create and mount the fastrtc Stream for conversation on the FastAPI app."""
     global _conversation_stream, _transcript_queue
-    _transcript_queue = asyncio.Queue()
+    _transcript_queue = TranscriptFeed()
+    app.state.external_profiles_dir = _configured_external_profiles_dir()
     try:
         from fastrtc import Stream
 
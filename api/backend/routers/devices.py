@@ -2,22 +2,49 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from typing import Any
+
 from fastapi import APIRouter, Request
 
 from grumpyreachy.audio_test import run_robot_mic_test, run_robot_speaker_test
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
+# PortAudio device enumeration is slow and the UI polls /audio/status, so names are reused briefly.
+_DEVICE_NAMES_TTL_SECONDS = 5.0
+_device_names_cache: tuple[float, tuple[str, ...]] | None = None
+_device_names_lock = threading.Lock()
+
+
+def _device_names() -> tuple[str, ...]:
+    """Host audio device names by index, re-enumerated at most once per TTL."""
+    global _device_names_cache
+    now = time.monotonic()
+    with _device_names_lock:
+        cached = _device_names_cache
+        if cached is None or now - cached[0] >= _DEVICE_NAMES_TTL_SECONDS:
+            import sounddevice as sd
+
+            cached = (now, tuple(str(device["name"]) for device in sd.query_devices()))
+            _device_names_cache = cached
+    return cached[1]
+
 
 def _get_mini(request: Request):
     """Get ReachyMini instance from the running robot app, or None."""
     robot = getattr(request.app.state.container, "robot", None)
-    if not robot:
+    return robot.mini if robot else None
+
+
+def _device_id(raw: Any) -> int | None:
+    if raw is None:
         return None
-    app = robot.get_app()
-    if not app or not getattr(app, "_controller", None):
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
         return None
-    return getattr(app._controller, "_mini", None)
 
 
 @router.get("/audio/status")
@@ -36,31 +63,20 @@ def devices_audio_status(request: Request) -> dict[str, object]:
     }
 
     if audio is not None:
-        raw_input_id = getattr(audio, "_input_device_id", None)
-        raw_output_id = getattr(audio, "_output_device_id", None)
-        try:
-            input_id = int(raw_input_id) if raw_input_id is not None else None
-        except (TypeError, ValueError):
-            input_id = None
-        try:
-            output_id = int(raw_output_id) if raw_output_id is not None else None
-        except (TypeError, ValueError):
-            output_id = None
+        input_id = _device_id(getattr(audio, "_input_device_id", None))
+        output_id = _device_id(getattr(audio, "_output_device_id", None))
         status["input_device_id"] = input_id
         status["output_device_id"] = output_id
         try:
-            import sounddevice as sd
-
-            devices = sd.query_devices()
-            if isinstance(input_id, int) and 0 <= input_id < len(devices):
-                status["input_device_name"] = str(devices[input_id]["name"])
-            if isinstance(output_id, int) and 0 <= output_id < len(devices):
-                status["output_device_name"] = str(devices[output_id]["name"])
+            names = _device_names()
+            if input_id is not None and 0 <= input_id < len(names):
+                status["input_device_name"] = names[input_id]
+            if output_id is not None and 0 <= output_id < len(names):
+                status["output_device_name"] = names[output_id]
         except Exception:
             pass
 
-    robot = getattr(request.app.state.container, "robot", None)
-    app = robot.get_app() if robot else None
+    app = request.app.state.container.robot.get_app()
     if app and hasattr(app, "get_audio_device_status"):
         status["selection"] = app.get_audio_device_status()
 
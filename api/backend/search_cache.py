@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from grumpyclaw.memory.retriever import Retriever
+
+_SEARCH_CACHE_SIZE = 512
+_SEARCH_CACHE_TTL_SECONDS = 300.0
+
+
+class SearchResultCache:
+    """Bounded TTL + LRU cache of hybrid search results keyed on normalized query text."""
+
+    def __init__(self, maxsize: int = _SEARCH_CACHE_SIZE, ttl: float = _SEARCH_CACHE_TTL_SECONDS) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.RLock()
+        # (db path, normalized query, top_k, snippet_chars) -> (stored at, hits)
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, list[dict[str, Any]]]] = OrderedDict()
+
+    def search(
+        self,
+        retriever: Retriever,
+        query: str,
+        top_k: int,
+        snippet_chars: int | None = None,
+    ) -> list[dict[str, Any]]:
+        key = (str(retriever.db_path), _normalize_query(query), top_k, snippet_chars)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self._ttl:
+                self._entries.move_to_end(key)
+                return list(entry[1])
+        hits = retriever.hybrid_search(query=query, top_k=top_k, snippet_chars=snippet_chars)
+        with self._lock:
+            self._entries[key] = (now, hits)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return list(hits)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+search_cache = SearchResultCache()
@@ -28,7 +28,7 @@ def build_state() -> AppState:
         events=events,
         robot=robot,
         assistant=assistant,
-        admin=AdminDataService(),
+        admin=AdminDataService(log_writers=(robot.action_writer, assistant.event_writer)),
     )
     assistant.start()
     return state
@@ -10,7 +10,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .backend.config import ApiConfig
-from .backend.db import init_app_db
+from .backend.db import close_pools, init_app_db
 from .backend.routers import admin, assistant, devices, robot, runtime, system
 from .backend.state import build_state
 
@@ -18,6 +18,8 @@ from .backend.state import build_state
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     load_dotenv()
+    # create_app() read the config before .env was loaded; re-read it with those values applied.
+    ApiConfig.from_env.cache_clear()
     init_app_db()
     app.state.container = build_state()
     if app.state.container.config.autostart_robot:
@@ -28,7 +30,8 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         app.state.container.assistant.shutdown()
-        app.state.container.robot.stop()
+        app.state.container.robot.shutdown()
+        close_pools()
 
 
 def create_app() -> FastAPI:
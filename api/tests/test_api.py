@@ -34,6 +34,12 @@ def test_assistant_session_create_and_post(client: TestClient) -> None:
     assert r.json()["queued"] is True
 
 
+def test_assistant_post_to_unknown_session(client: TestClient) -> None:
+    r = client.post("/api/v1/assistant/sessions/missing/messages", json={"content": "hello"})
+    assert r.status_code == 404
+    assert r.json()["detail"] == "session not found"
+
+
 def test_robot_requires_confirm_for_look(client: TestClient) -> None:
     r = client.post("/api/v1/robot/actions", json={"action": "look_at", "x": 0.1, "y": 0.1, "z": 0.2})
     assert r.status_code == 200
@@ -54,6 +60,47 @@ def test_runtime_heartbeat_controls(client: TestClient) -> None:
     assert "trigger" in body
 
 
+def test_heartbeat_run_now_visible_to_reads(client: TestClient) -> None:
+    r = client.post("/api/v1/runtime/heartbeat/run-now")
+    assert r.status_code == 200
+
+    r = client.get("/api/v1/heartbeat/history")
+    assert r.status_code == 200
+    assert len(r.json()) == 1
+
+    r = client.get("/api/v1/logs", params={"source": "runtime", "event_type": "runtime.heartbeat"})
+    assert r.status_code == 200
+    assert len(r.json()["items"]) == 1
+
+
+def test_realtime_history_keyset_pages(client: TestClient) -> None:
+    assistant = client.app.state.container.assistant
+    for n in range(5):
+        assistant._on_realtime_event("realtime.test", {"n": n})
+
+    def page(**params: int) -> tuple[list[int], int | None]:
+        r = client.get("/api/v1/assistant/realtime/history", params={"limit": 2, **params})
+        assert r.status_code == 200
+        body = r.json()
+        return [item["payload"]["n"] for item in body["items"]], body["next_cursor"]
+
+    newest, cursor = page()
+    assert newest == [3, 4]
+    older, cursor = page(before_id=cursor)
+    assert older == [1, 2]
+    oldest, cursor = page(before_id=cursor)
+    assert oldest == [0]
+    assert cursor is None
+
+    first, cursor = page(after_id=0)
+    assert first == [0, 1]
+    second, cursor = page(after_id=cursor)
+    assert second == [2, 3]
+    last, cursor = page(after_id=cursor)
+    assert last == [4]
+    assert cursor is None
+
+
 def test_old_chat_and_conversation_routes_removed(client: TestClient) -> None:
     assert client.get("/api/v1/chat/sessions").status_code == 404
     assert client.get("/api/v1/conversation/status").status_code == 404
@@ -84,3 +131,24 @@ def test_logs_filter_by_source_level_and_query(client: TestClient) -> None:
         assert item["source"] == "robot"
         assert item["level"] == "WARNING"
         assert item["event_type"] == "robot.action"
+
+
+def test_logs_cursor_pagination(client: TestClient) -> None:
+    for _ in range(3):
+        r = client.post("/api/v1/robot/actions", json={"action": "look_at", "x": 0.1, "y": 0.1, "z": 0.2})
+        assert r.status_code == 200
+
+    r = client.get("/api/v1/logs", params={"source": "robot", "limit": 2})
+    assert r.status_code == 200
+    first = r.json()
+    assert len(first["items"]) == 2
+    assert first["next_cursor"]
+
+    r = client.get("/api/v1/logs", params={"source": "robot", "limit": 2, "cursor": first["next_cursor"]})
+    assert r.status_code == 200
+    second = r.json()
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+
+    r = client.get("/api/v1/logs", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
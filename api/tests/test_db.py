@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
-from api.backend.db import get_conn, init_app_db
+import pytest
+
+from api.backend.db import BatchWriter, close_pools, get_conn, init_app_db, read_conn, write_conn
 
 
 def test_init_app_db_creates_tables(monkeypatch, tmp_path: Path):
@@ -27,5 +30,80 @@ def test_init_app_db_creates_tables(monkeypatch, tmp_path: Path):
         robot_cols = {row["name"] for row in conn.execute("PRAGMA table_info(app_robot_actions)").fetchall()}
         assert "source" in robot_cols
         assert "level" in robot_cols
+
+        message_indexes = {row["name"] for row in conn.execute("PRAGMA index_list(app_chat_messages)").fetchall()}
+        assert "idx_app_chat_messages_session_created" in message_indexes
+        assert "idx_app_chat_messages_session" not in message_indexes
     finally:
         conn.close()
+
+
+def test_get_conn_applies_pragmas(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("GRUMPYCLAW_DB_PATH", str(tmp_path / "pragma.db"))
+    init_app_db()
+
+    conn = get_conn()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        conn.close()
+
+
+def test_pooled_readers_are_read_only(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("GRUMPYCLAW_DB_PATH", str(tmp_path / "pool.db"))
+    init_app_db()
+    try:
+        with write_conn() as conn:
+            conn.execute(
+                "INSERT INTO app_heartbeat_history(status, message, context_json) VALUES (?, ?, ?)",
+                ("HEARTBEAT_OK", "", "{}"),
+            )
+        with read_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM app_heartbeat_history").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM app_heartbeat_history")
+    finally:
+        close_pools()
+
+
+def test_batch_writer_flushes_in_order(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("GRUMPYCLAW_DB_PATH", str(tmp_path / "batch.db"))
+    init_app_db()
+    writer = BatchWriter(max_batch=4)
+    try:
+        for i in range(10):
+            writer.submit("INSERT INTO app_realtime_events(event_type, payload_json) VALUES (?, ?)", (f"e{i}", "{}"))
+        writer.flush()
+        with read_conn() as conn:
+            rows = conn.execute("SELECT event_type FROM app_realtime_events ORDER BY id").fetchall()
+        assert [row[0] for row in rows] == [f"e{i}" for i in range(10)]
+
+        writer.close()
+        writer.submit("INSERT INTO app_realtime_events(event_type, payload_json) VALUES (?, ?)", ("late", "{}"))
+        with read_conn() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM app_realtime_events").fetchone()[0] == 11
+    finally:
+        writer.close()
+        close_pools()
+
+
+def test_batch_writer_isolates_failing_group(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("GRUMPYCLAW_DB_PATH", str(tmp_path / "batch-fail.db"))
+    init_app_db()
+    insert = "INSERT INTO app_realtime_events(event_type, payload_json) VALUES (?, ?)"
+    writer = BatchWriter()
+    try:
+        # Holding the writer connection makes the queued groups coalesce into one batch.
+        with write_conn():
+            writer.submit(insert, ("first", "{}"))
+            writer.submit_many([(insert, ("same-group", "{}")), ("INSERT INTO missing_table VALUES (?)", (1,))])
+            writer.submit(insert, ("after", "{}"))
+        writer.flush()
+        with read_conn() as conn:
+            rows = conn.execute("SELECT event_type FROM app_realtime_events ORDER BY id").fetchall()
+        assert [row[0] for row in rows] == ["first", "after"]
+    finally:
+        writer.close()
+        close_pools()
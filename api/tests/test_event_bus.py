@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from api.backend.event_bus import _SUBSCRIBER_BUFFER, EventBus, StreamEvent, sse_stream
+
+
+def _open_stream(bus: EventBus, channel: str):
+    """Start sse_stream on a reader thread and return it once the first frame has been read."""
+    stream = sse_stream(channel, bus)
+    received: list[bytes] = []
+    reader = threading.Thread(target=lambda: received.append(next(stream)))
+    reader.start()
+    # The generator only subscribes once it starts running.
+    deadline = time.monotonic() + 5.0
+    while channel not in bus._subs and time.monotonic() < deadline:
+        time.sleep(0.001)
+    publisher = threading.Thread(target=bus.publish, args=(channel, StreamEvent("robot.status", {"ok": True})))
+    publisher.start()
+    publisher.join()
+    reader.join(timeout=5.0)
+    return stream, received
+
+
+def test_sse_stream_encodes_frames_published_from_another_thread():
+    bus = EventBus()
+    stream, received = _open_stream(bus, "runtime")
+    assert received == [b'event: robot.status\ndata: {"ok":true}\n\n']
+
+    stream.close()
+    assert "runtime" not in bus._subs
+
+
+def test_sse_stream_joins_bursts_and_drops_oldest_on_overflow():
+    bus = EventBus()
+    stream, _ = _open_stream(bus, "chat")
+
+    for n in range(3):
+        bus.publish("chat", StreamEvent("chat.token", {"n": n}))
+    chunk = next(stream)
+    assert chunk == b"".join(f'event: chat.token\ndata: {{"n":{n}}}\n\n'.encode() for n in range(3))
+
+    for n in range(_SUBSCRIBER_BUFFER + 10):
+        bus.publish("chat", StreamEvent("chat.token", {"n": n}))
+    chunk = next(stream)
+    assert chunk.count(b"event: chat.token") == _SUBSCRIBER_BUFFER
+    assert chunk.startswith(b'event: chat.token\ndata: {"n":10}\n\n')
+
+    stream.close()
+    assert "chat" not in bus._subs
+
+
+def test_unsubscribe_removes_channel():
+    bus = EventBus()
+    first = bus.subscribe("runtime")
+    second = bus.subscribe("runtime")
+    bus.unsubscribe("runtime", first)
+    assert bus._subs["runtime"] == (second,)
+    bus.unsubscribe("runtime", second)
+    assert "runtime" not in bus._subs
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+
+from api.backend.reply_cache import ReplyCache, history_scope
+
+
+def _embedder(vectors: dict[str, list[float]]):
+    def embed(text: str) -> list[float]:
+        return vectors[text]
+
+    return embed
+
+
+def _unit(cosine: float) -> list[float]:
+    """2-d vector whose cosine similarity with [1, 0] is ``cosine``."""
+    return [cosine, math.sqrt(1.0 - cosine * cosine)]
+
+
+def test_exact_hit_uses_normalized_prompt() -> None:
+    def embed(text: str) -> list[float]:
+        raise RuntimeError("embedding unavailable")
+
+    cache = ReplyCache(embed)
+    cache.store("Hello there", "hi")
+    assert cache.lookup("  hello   THERE ") == "hi"
+    assert cache.lookup("hello again") is None
+
+
+def test_semantic_hit_at_threshold_and_miss_below() -> None:
+    vectors = {
+        "what is grumpyclaw": [1.0, 0.0],
+        "above": _unit(0.951),
+        "below": _unit(0.949),
+    }
+    cache = ReplyCache(_embedder(vectors))
+    cache.store("what is grumpyclaw", "an assistant")
+    assert cache.lookup("above") == "an assistant"
+    assert cache.lookup("below") is None
+
+    # A score exactly equal to the threshold counts as a hit.
+    score = float(np.asarray(_unit(0.95), dtype=np.float32)[0])
+    vectors["at"] = [score, math.sqrt(1.0 - score * score)]
+    at = ReplyCache(_embedder(vectors), threshold=score)
+    at.store("what is grumpyclaw", "an assistant")
+    assert at.lookup("at") == "an assistant"
+
+
+def test_uncacheable_prompts() -> None:
+    assert ReplyCache.cacheable("tell me a joke")
+    assert not ReplyCache.cacheable("make the robot nod")
+    assert not ReplyCache.cacheable("what is the latest news")
+    assert not ReplyCache.cacheable("x" * 500)
+
+
+def test_ring_eviction_drops_oldest_entry() -> None:
+    vectors = {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]}
+    cache = ReplyCache(_embedder(vectors), maxsize=2)
+    for prompt in ("a", "b", "c"):
+        cache.store(prompt, prompt.upper())
+    assert cache.lookup("a") is None
+    assert cache.lookup("b") == "B"
+    assert cache.lookup("c") == "C"
+
+
+def test_scope_isolates_follow_ups() -> None:
+    vectors = {"why?": [1.0, 0.0], "why": [1.0, 0.0]}
+    cache = ReplyCache(_embedder(vectors))
+    first = history_scope(
+        "grumpyclaw", [{"role": "user", "content": "is the sky blue"}, {"role": "assistant", "content": "yes"}]
+    )
+    second = history_scope(
+        "grumpyclaw", [{"role": "user", "content": "is grass red"}, {"role": "assistant", "content": "no"}]
+    )
+    assert first != second
+    cache.store("why?", "because of scattering", first)
+    assert cache.lookup("why?", first) == "because of scattering"
+    assert cache.lookup("why?", second) is None
+    assert cache.lookup("why", second) is None
+    assert cache.lookup("why?", history_scope("grumpyclaw", [])) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    vectors = {"what is grumpyclaw": [1.0, 0.0], "what's grumpyclaw": _unit(0.99)}
+    cache = ReplyCache(_embedder(vectors), ttl=60.0)
+    cache.store("what is grumpyclaw", "an assistant")
+
+    now[0] += 59.0
+    assert cache.lookup("what is grumpyclaw") == "an assistant"
+    assert cache.lookup("what's grumpyclaw") == "an assistant"
+
+    now[0] += 1.0
+    assert cache.lookup("what is grumpyclaw") is None
+    assert cache.lookup("what's grumpyclaw") is None
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+from api.backend.assistant._resample_kernel import LinearResampler, resample_int16
+
+
+def test_resample_int16_tracks_linear_interpolation() -> None:
+    samples = np.random.default_rng(0).integers(-32768, 32767, size=480, dtype=np.int16)
+    out = resample_int16(samples, 24000, 16000)
+    assert out.dtype == np.int16
+    assert out.shape == (320,)
+    expected = np.interp(np.arange(320) * 1.5, np.arange(480), samples.astype(np.float64))
+    assert np.abs(out - expected).max() <= 1.0
+
+
+def test_resample_int16_passthrough_and_extremes() -> None:
+    samples = np.array([-32768, 32767, -32768, 32767], dtype=np.int16)
+    assert resample_int16(samples, 16000, 16000) is samples
+    out = resample_int16(samples, 16000, 24000)
+    assert out.min() >= -32768 and out.max() <= 32767
+    assert resample_int16(np.array([], dtype=np.int16), 24000, 16000).size == 0
+
+
+def test_linear_resampler_averages_integer_ratio() -> None:
+    resampler = LinearResampler(48000, 24000)
+    samples = np.array([1, 3, -5, -6, 32767, 32767, -32768, -32767, 7], dtype=np.int16)
+    assert resampler.process(samples).tolist() == [2, -6, 32767, -32768, 7]
+    assert resampler.process(samples[:4]).tolist() == [2, -6]
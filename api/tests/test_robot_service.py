@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from api.backend.config import ApiConfig
+from api.backend.db import close_pools, init_app_db
+from api.backend.event_bus import EventBus
+from api.backend.robot_service import _MAX_RATE_BUCKETS, RobotService
+
+_SECOND_NS = 1_000_000_000
+
+
+@pytest.fixture()
+def clock(monkeypatch) -> list[int]:
+    now = [1_000 * _SECOND_NS]
+    monkeypatch.setattr(time, "monotonic_ns", lambda: now[0])
+    return now
+
+
+@pytest.fixture()
+def robot(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("GRUMPYCLAW_DB_PATH", str(tmp_path / "robot.db"))
+    init_app_db()
+    service = RobotService(event_bus=EventBus(), config=ApiConfig(robot_rate_limit_seconds=1.0))
+    try:
+        yield service
+    finally:
+        service.shutdown()
+        close_pools()
+
+
+def test_action_rate_limit_per_action(robot: RobotService, clock: list[int]) -> None:
+    look = {"action": "look_at", "x": 0.1, "y": 0.1, "z": 0.2}
+    assert robot.enqueue_action(look).reason == "look_at requires confirm=true"
+
+    clock[0] += _SECOND_NS // 2
+    limited = robot.enqueue_action(look)
+    assert limited.accepted is False
+    assert limited.reason == "Action rate limited"
+    assert robot.enqueue_action({"action": "nod"}).reason != "Action rate limited"
+
+    clock[0] += _SECOND_NS // 2
+    assert robot.enqueue_action(look).reason == "look_at requires confirm=true"
+
+
+def test_rate_buckets_evicted_past_limit(robot: RobotService, clock: list[int]) -> None:
+    for n in range(_MAX_RATE_BUCKETS):
+        assert robot._try_consume(f"action-{n}")
+    assert len(robot._buckets) == _MAX_RATE_BUCKETS
+
+    # Every tracked bucket has refilled by now, so the next new name triggers a rebuild.
+    clock[0] += _SECOND_NS
+    assert robot._try_consume("late")
+    assert robot._buckets == {"late": clock[0] + _SECOND_NS}
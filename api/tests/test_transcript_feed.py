@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from api.backend.routers.conversation import _TRANSCRIPT_DRAIN_MAX, TranscriptFeed
+
+
+def test_transcript_feed_wakes_on_append_from_another_thread():
+    async def run() -> None:
+        feed = TranscriptFeed()
+        assert await feed.wait(timeout=0.01) is False
+
+        def produce() -> None:
+            time.sleep(0.02)
+            for n in range(100):
+                feed.append({"role": "user", "content": str(n)})
+
+        worker = threading.Thread(target=produce)
+        worker.start()
+        assert await feed.wait(timeout=5.0) is True
+        worker.join(timeout=5.0)
+
+        first = feed.drain(_TRANSCRIPT_DRAIN_MAX)
+        assert [msg["content"] for msg in first] == [str(n) for n in range(_TRANSCRIPT_DRAIN_MAX)]
+        assert len(feed.drain(_TRANSCRIPT_DRAIN_MAX)) == 100 - _TRANSCRIPT_DRAIN_MAX
+        assert await feed.wait(timeout=0.01) is False
+
+    asyncio.run(run())
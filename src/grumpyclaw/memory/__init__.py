@@ -2,6 +2,6 @@
 
 from grumpyclaw.memory.db import get_db_path, init_db
 from grumpyclaw.memory.indexer import Indexer
-from grumpyclaw.memory.retriever import Retriever
+from grumpyclaw.memory.retriever import Retriever, get_retriever
 
-__all__ = ["get_db_path", "init_db", "Indexer", "Retriever"]
+__all__ = ["get_db_path", "init_db", "Indexer", "Retriever", "get_retriever"]
@@ -7,6 +7,7 @@ import math
 import os
 import re
 import sqlite3
+from functools import lru_cache
 from pathlib import Path
 
 from grumpyclaw.memory.db import get_db_path, init_db
@@ -84,14 +85,21 @@ class Retriever:
             )
         return self._model
 
+    def embed(self, text: str) -> list[float]:
+        """Embedding vector for one piece of text, from the same model used for search."""
+        (emb,) = list(self._get_model().embed([text]))
+        return list(emb)
+
     def hybrid_search(
         self,
         query: str,
         top_k: int = 10,
+        snippet_chars: int | None = None,
     ) -> list[dict]:
         """
         Return top_k chunks by combined score: 0.7 * norm_cosine + 0.3 * norm_bm25.
         Each result: {content, title, source_id, source_type, score}.
+        If snippet_chars is set, content is cut to that many characters by SQLite.
         """
         init_db(self.db_path)
         query = query.strip()
@@ -101,6 +109,11 @@ class Retriever:
         model = self._get_model()
         (query_emb,) = list(model.embed([query]))
 
+        if snippet_chars is None:
+            content_col, content_params = "content", []
+        else:
+            content_col, content_params = "substr(content, 1, ?) AS content", [snippet_chars]
+
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
         try:
@@ -127,21 +140,22 @@ class Retriever:
                 placeholders = ",".join("?" * len(chunk_ids))
                 rows = conn.execute(
                     f"""
-                    SELECT id, source_type, source_id, title, content, embedding
+                    SELECT id, source_type, source_id, title, {content_col}, embedding
                     FROM chunks
                     WHERE id IN ({placeholders})
                     """,
-                    chunk_ids,
+                    [*content_params, *chunk_ids],
                 ).fetchall()
             else:
                 # Fallback: vector-only over all chunks (limit for perf)
                 rows = conn.execute(
-                    """
-                    SELECT id, source_type, source_id, title, content, embedding
+                    f"""
+                    SELECT id, source_type, source_id, title, {content_col}, embedding
                     FROM chunks
                     ORDER BY id
                     LIMIT 500
-                    """
+                    """,
+                    content_params,
                 ).fetchall()
                 bm25_by_id = {}
 
@@ -182,3 +196,13 @@ class Retriever:
             ]
         finally:
             conn.close()
+
+
+def get_retriever(db_path: Path | None = None) -> Retriever:
+    """Return the process-wide Retriever for db_path (default: configured db), so the model loads once."""
+    return _shared_retriever(Path(db_path or get_db_path()).resolve())
+
+
+@lru_cache(maxsize=8)
+def _shared_retriever(db_path: Path) -> Retriever:
+    return Retriever(db_path=db_path)
@@ -1,5 +1,5 @@
 """Local skills registry: discover SKILL.md files and load content."""
 
-from grumpyclaw.skills.registry import get_skill_content, list_skills
+from grumpyclaw.skills.registry import cached_skills, clear_skills_cache, get_skill_content, list_skills
 
-__all__ = ["list_skills", "get_skill_content"]
+__all__ = ["list_skills", "cached_skills", "clear_skills_cache", "get_skill_content"]
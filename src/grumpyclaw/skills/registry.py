@@ -3,8 +3,14 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from pathlib import Path
 
+_SKILLS_CACHE_TTL_SECONDS = 60.0
+_skills_cache: tuple[tuple[Path, ...], float, list[dict]] | None = None
+_skills_cache_lock = threading.Lock()
+
 
 def _default_skills_dirs() -> list[Path]:
     """Default directories to scan for SKILL.md (project skills/ and .cursor/skills/)."""
@@ -57,6 +63,29 @@ def list_skills() -> list[dict]:
     return out
 
 
+def cached_skills(ttl: float = _SKILLS_CACHE_TTL_SECONDS) -> list[dict]:
+    """
+    Return list_skills() results, rescanning at most once per `ttl` seconds.
+    The cache is also dropped when the configured skills directories change.
+    """
+    global _skills_cache
+    dirs = tuple(_get_skills_dir())
+    now = time.monotonic()
+    with _skills_cache_lock:
+        cached = _skills_cache
+        if cached is None or cached[0] != dirs or now - cached[1] >= ttl:
+            cached = (dirs, now, list_skills())
+            _skills_cache = cached
+    return list(cached[2])
+
+
+def clear_skills_cache() -> None:
+    """Force the next cached_skills() call to rescan the skills directories."""
+    global _skills_cache
+    with _skills_cache_lock:
+        _skills_cache = None
+
+
 def get_skill_content(skill_id: str) -> str:
     """Return full markdown content for a skill by id (from list_skills)."""
     for s in list_skills():
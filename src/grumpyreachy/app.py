@@ -12,7 +12,7 @@ import time
 from contextlib import nullcontext
 from pathlib import Path
 from types import TracebackType
-from typing import Any
+from typing import Any, Callable
 
 from grumpyreachy.actions import ControlAction
 from grumpyreachy.config import GrumpyReachyConfig
@@ -93,7 +93,9 @@ class GrumpyReachyApp:
         self.config = config or GrumpyReachyConfig.from_env()
         self.log = logging.getLogger("grumpyreachy.app")
         self.stop_event = threading.Event()
-        self.state = RunState.STARTING
+        self._state = RunState.STARTING
+        # Called on run state or robot connection changes, from whichever thread made the change.
+        self.on_status_change: Callable[[], None] | None = None
         self.control_queue: queue.Queue[ControlAction] = queue.Queue(maxsize=200)
         self._worker_thread: threading.Thread | None = None
         self._observer_thread: threading.Thread | None = None
@@ -129,6 +131,7 @@ class GrumpyReachyApp:
         try:
             with conn_ctx as mini:
                 self._controller = RobotController(mini=mini)
+                self._controller.on_connection_lost = self._notify_status_change
                 self._feedback.update_controller(self._controller)
                 self._configure_audio_devices(mini)
                 self._movement_manager = MovementManager(self._controller)
@@ -167,6 +170,26 @@ class GrumpyReachyApp:
             self._shutdown()
         return 0
 
+    @property
+    def state(self) -> RunState:
+        return self._state
+
+    @state.setter
+    def state(self, value: RunState) -> None:
+        if value is self._state:
+            return
+        self._state = value
+        self._notify_status_change()
+
+    def _notify_status_change(self) -> None:
+        callback = self.on_status_change
+        if callback is None:
+            return
+        try:
+            callback()
+        except Exception:
+            self.log.exception("status change callback failed")
+
     def enqueue(self, action: ControlAction) -> bool:
         if self.stop_event.is_set():
             return False
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 DEFAULT_PREFERRED_INPUT_DEVICE = "respeaker,seeed-4mic,4mic,voicecard,ac108"
 
@@ -77,7 +78,9 @@ class GrumpyReachyConfig:
     preferred_output_device: str = ""
 
     @classmethod
+    @lru_cache(maxsize=1)
     def from_env(cls) -> "GrumpyReachyConfig":
+        """Read the environment once; later calls share the same frozen instance (see cache_clear)."""
         return cls(
             observe_interval_seconds=_get_int("GRUMPYREACHY_OBSERVE_INTERVAL", 600),
             feedback_enabled=_get_bool("GRUMPYREACHY_FEEDBACK_ENABLED", True),
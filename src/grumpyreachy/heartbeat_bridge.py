@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from typing import Any
 
 from grumpyclaw.llm.client import chat
@@ -101,3 +102,9 @@ class HeartbeatBridge:
 
 def heartbeat_result_to_json(result: HeartbeatResult) -> str:
     return json.dumps(asdict(result), ensure_ascii=True)
+
+
+@lru_cache(maxsize=1)
+def get_heartbeat_bridge() -> HeartbeatBridge:
+    """Return the shared default HeartbeatBridge."""
+    return HeartbeatBridge()
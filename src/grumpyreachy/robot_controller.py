@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any
+from typing import Any, Callable
 
 try:
     from reachy_mini.motion.recorded_move import RecordedMoves
@@ -25,6 +25,8 @@ class RobotController:
         self._mini = mini
         self._log = logging.getLogger("grumpyreachy.robot")
         self._connection_lost = False
+        # Called once, from the failing caller's thread, when the robot connection drops.
+        self.on_connection_lost: Callable[[], None] | None = None
         self._last_connection_error_log: float = 0.0
         self._builtin_motion_index: dict[str, tuple[str, str]] | None = None
         self._builtin_motion_catalogs: dict[str, Any] = {}
@@ -47,6 +49,14 @@ class RobotController:
     def connected(self) -> bool:
         return self._mini is not None and not self._connection_lost
 
+    def _mark_connection_lost(self) -> None:
+        if self._connection_lost:
+            return
+        self._connection_lost = True
+        callback = self.on_connection_lost
+        if callback is not None:
+            callback()
+
     def look_at(self, x: float, y: float, z: float, duration: float = 1.0) -> None:
         if not self._mini or self._connection_lost:
             return
@@ -54,7 +64,7 @@ class RobotController:
             self._mini.look_at_world(x=x, y=y, z=z, duration=duration)
         except Exception as e:
             if _is_connection_error(e):
-                self._connection_lost = True
+                self._mark_connection_lost()
                 self._log.warning("Robot connection lost (look_at)")
             else:
                 self._log.exception("look_at failed")
@@ -70,7 +80,7 @@ class RobotController:
             self._mini.look_at_world(x=0.35, y=0.0, z=0.05, duration=0.25)
         except Exception as e:
             if _is_connection_error(e):
-                self._connection_lost = True
+                self._mark_connection_lost()
                 self._log.warning("Robot connection lost (nod)")
             else:
                 self._log.exception("nod failed")
@@ -94,7 +104,7 @@ class RobotController:
             self._mini.set_target_antenna_joint_positions(target)
         except Exception as e:
             if _is_connection_error(e):
-                self._connection_lost = True
+                self._mark_connection_lost()
                 self._log.warning("Robot connection lost (antenna_feedback)")
             else:
                 self._log.exception("antenna_feedback failed for state=%s", state)
@@ -114,7 +124,7 @@ class RobotController:
             self._mini.set_target_antenna_joint_positions(positions)
         except Exception as e:
             if _is_connection_error(e):
-                self._connection_lost = True
+                self._mark_connection_lost()
                 now = time.monotonic()
                 if now - self._last_connection_error_log >= 10.0:
                     self._last_connection_error_log = now
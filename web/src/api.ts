@@ -37,7 +37,10 @@ export const api = {
   assistantRealtimeStatus: () =>
     req<{ running: boolean; connected: boolean; thread_alive: boolean; model: string; last_error?: string | null }>("/assistant/realtime/status"),
   assistantRealtimeHistory: (limit = 200) =>
-    req<Array<{ id: number; event_type: string; payload: Record<string, unknown>; created_at: string }>>(`/assistant/realtime/history?limit=${limit}`),
+    req<{
+      items: Array<{ id: number; event_type: string; payload: Record<string, unknown>; created_at: string }>;
+      next_cursor: number | null;
+    }>(`/assistant/realtime/history?limit=${limit}`),
 
   runtimeStatus: () => req<Record<string, unknown>>("/runtime/status"),
   runtimeHeartbeatStart: () => req<Record<string, unknown>>("/runtime/heartbeat/start", { method: "POST" }),
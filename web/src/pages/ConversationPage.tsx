@@ -31,7 +31,7 @@ export function ConversationPage() {
 
   const loadHistory = useCallback(async () => {
     try {
-      const rows = await api.assistantRealtimeHistory(200);
+      const { items: rows } = await api.assistantRealtimeHistory(200);
       const mapped = rows.map((row) => {
         const payload = row.payload as Record<string, unknown>;
         const ts = String(payload.ts ?? row.created_at ?? "");